@@ -0,0 +1,188 @@
+import itertools
+import re
+import threading
+
+from core.sharding import account_key
+
+# "You have 4 attempt(s) left or else your account will be locked."
+ATTEMPTS_LEFT_RE = re.compile(r"(\d+)\s+attempt(?:\(s\)|s)?\s+left", re.IGNORECASE)
+
+
+def parse_attempts_left(messages):
+    """Remaining attempts announced by the lockout messages: N for "N
+    attempt(s) left", 0 once the account is reported locked, else None."""
+    for message in messages or ():
+        match = ATTEMPTS_LEFT_RE.search(message)
+        if match:
+            return int(match.group(1))
+    for message in messages or ():
+        if "locked" in message.lower() and "will be locked" not in message.lower():
+            return 0
+    return None
+
+
+class Account:
+    """A test account and what is known about its lockout budget."""
+
+    def __init__(self, email, password, budget=5):
+        self.email = email
+        self.password = password
+        self.budget = budget
+        self.remaining = budget
+        self.locked = False
+
+    @property
+    def key(self):
+        return self.email.strip().lower()
+
+    def as_dict(self):
+        return {"email": self.email, "remaining": self.remaining, "locked": self.locked}
+
+
+class AccountPool:
+    """Test accounts with lockout budgets.
+
+    Every account starts with `budget` failed logins allowed; `reserve` of
+    them are never spent, so scheduled attempts cannot lock an account.
+    The budget is corrected from the server's "N attempt(s) left" messages
+    and, when `success_resets` is set, restored by a successful login.
+    """
+
+    def __init__(self, accounts, budget=5, reserve=1, success_resets=True):
+        self.reserve = reserve
+        self.success_resets = success_resets
+        self.accounts = {}
+        for account in accounts:
+            if not isinstance(account, Account):
+                account = Account(account["email"], account["password"],
+                                  account.get("budget", budget))
+            self.accounts[account.key] = account
+
+    def get(self, email):
+        return self.accounts.get((email or "").strip().lower())
+
+    def can_spend(self, account, cost):
+        if account.locked:
+            return False
+        return cost == 0 or account.remaining - cost >= self.reserve
+
+    def observe(self, account, login_success, errors, cost):
+        """Update the budget after an attempt against `account`."""
+        left = parse_attempts_left(errors)
+        if login_success:
+            if self.success_resets:
+                account.remaining = account.budget
+        elif left is not None:
+            account.remaining = left
+            account.locked = left == 0
+        else:
+            account.remaining = max(0, account.remaining - cost)
+
+    def stats(self):
+        return [account.as_dict() for account in self.accounts.values()]
+
+
+class AttemptScheduler:
+    """Hands attempts to concurrent workers without exhausting lockout budgets.
+
+    Attempts without an "email" are assigned a pool account (the one with
+    the most budget left); if they have no "password" either, the account's
+    own password is used. Attempts with an "email" run against that address
+    and, if it is a pool account, spend its budget. Attempts expected to fail
+    cost one attempt of budget. Only one attempt per account runs at a time.
+
+    When no account can afford the next attempt it is deferred and later
+    attempts run first; a deferred attempt is retried once a successful login
+    or a lockout message frees budget. Attempts that still cannot run when
+    nothing else is pending end up in `deferred` instead of locking an account.
+
+    `attempts` may be a lazy stream (with `numbered`, of (attempt_no, attempt)
+    pairs); only a window of `lookahead` attempts is read ahead, growing only
+    while nothing in the window can run.
+    """
+
+    def __init__(self, attempts, pool, key=account_key, numbered=False, lookahead=64):
+        self.pool = pool
+        self.key = key
+        self.source = iter(attempts if numbered else enumerate(attempts, start=1))
+        self.lookahead = lookahead
+        self.pending = []
+        self.deferred = []
+        self._busy = set()
+        self._running = 0
+        self._cond = threading.Condition()
+
+    @staticmethod
+    def cost(attempt):
+        return 0 if attempt.get("expected_login") else 1
+
+    def _assign(self, attempt):
+        """(lease key, account or None, attempt to run) or None if not runnable now."""
+        cost = self.cost(attempt)
+        if attempt.get("email"):
+            key = self.key(attempt)
+            if key in self._busy:
+                return None
+            account = self.pool.get(attempt["email"])
+            if account is not None and not self.pool.can_spend(account, cost):
+                return None
+            return key, account, attempt
+
+        candidates = [
+            account for account in self.pool.accounts.values()
+            if account.key not in self._busy and self.pool.can_spend(account, cost)
+        ]
+        if not candidates:
+            return None
+        account = max(candidates, key=lambda a: a.remaining)
+        assigned = dict(attempt, email=account.email)
+        assigned.setdefault("password", account.password)
+        return account.key, account, assigned
+
+    def _read(self, count):
+        """Pull up to `count` more attempts into the window; False once exhausted."""
+        for item in itertools.islice(self.source, count):
+            self.pending.append(item)
+            count -= 1
+        return count == 0
+
+    def _take(self):
+        if len(self.pending) < self.lookahead:
+            self._read(self.lookahead - len(self.pending))
+        for pos, (idx, attempt) in enumerate(self.pending):
+            assignment = self._assign(attempt)
+            if assignment is not None:
+                del self.pending[pos]
+                return idx, assignment
+        return None
+
+    def next(self):
+        """Block until an attempt can run; returns (attempt_no, attempt, lease)
+        or None once every attempt has run or been deferred."""
+        with self._cond:
+            while True:
+                taken = self._take()
+                if taken is not None:
+                    idx, (key, account, attempt) = taken
+                    self._busy.add(key)
+                    self._running += 1
+                    return idx, attempt, (key, account)
+                if not self.pending:
+                    return None
+                if not self._running:
+                    if self._read(1):
+                        continue
+                    # Nothing in flight can free budget any more.
+                    self.deferred.extend(self.pending)
+                    self.pending = []
+                    return None
+                self._cond.wait()
+
+    def done(self, lease, attempt, login_success, errors):
+        key, account = lease
+        with self._cond:
+            if account is not None:
+                self.pool.observe(account, login_success, errors, self.cost(attempt))
+            self._busy.discard(key)
+            self._running -= 1
+            self._cond.notify_all()
@@ -0,0 +1,240 @@
+import argparse
+import re
+import sys
+from array import array
+
+import numpy as np
+
+from core.result_store import iter_runs
+
+PERCENTILES = (50, 95, 99)
+_NUMBERS = re.compile(r"\d+")
+
+
+def normalize_message(message):
+    """Group messages that only differ by numbers ("4 attempt(s) left")."""
+    return _NUMBERS.sub("N", " ".join(message.split()))
+
+
+class _Codes:
+    """Dictionary encoding: string → small int, strings kept once."""
+
+    def __init__(self):
+        self.index = {}
+        self.values = []
+
+    def code(self, value):
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class AttemptTable:
+    """Attempts from one or more result stores as NumPy columns.
+
+    One row per attempt: `run` (run number, in store order), `label`
+    (dictionary code into `labels`), `passed` (test_case_success),
+    `login` (login_success), `duration` (timings total in seconds, NaN if
+    unknown) and `decided_by` (code into `decided_by_values`). Runs carry
+    `run_day` (datetime64[D]). Error messages form a second table of
+    (`message_row`, `message`) pairs with codes into `messages`.
+
+    Runs are streamed from the stores into typed buffers, so no nested
+    Python object tree of the whole history is ever built.
+    """
+
+    def __init__(self):
+        self.labels = []
+        self.messages = []
+        self.decided_by_values = []
+        self.run = self.label = self.passed = self.login = self.duration = None
+        self.decided_by = self.run_day = self.message_row = self.message = None
+
+    def __len__(self):
+        return 0 if self.run is None else len(self.run)
+
+    @classmethod
+    def from_runs(cls, runs, last=None):
+        labels, messages, deciders = _Codes(), _Codes(), _Codes()
+        run_col, label_col, decided_col, msg_row, msg_col = (array("i") for _ in range(5))
+        passed_col, login_col = array("b"), array("b")
+        duration_col = array("d")
+        days = []
+        row = 0
+        for run_no, run in enumerate(runs):
+            days.append((run.get("timestamp") or "")[:10] or "NaT")
+            for attempt in run.get("attempts", ()):
+                run_col.append(run_no)
+                label_col.append(labels.code(attempt.get("label") or "?"))
+                passed_col.append(bool(attempt.get("test_case_success", True)))
+                login_col.append(bool(attempt.get("login_success")))
+                total = (attempt.get("timings") or {}).get("total")
+                duration_col.append(float("nan") if total is None else total)
+                decided_col.append(deciders.code(attempt.get("decided_by") or "unknown"))
+                for message in attempt.get("error_messages") or ():
+                    msg_row.append(row)
+                    msg_col.append(messages.code(normalize_message(message)))
+                row += 1
+
+        table = cls()
+        table.labels, table.messages, table.decided_by_values = labels.values, messages.values, deciders.values
+        table.run = np.frombuffer(run_col, dtype=np.int32) if run_col else np.zeros(0, np.int32)
+        table.label = np.frombuffer(label_col, dtype=np.int32) if label_col else np.zeros(0, np.int32)
+        table.passed = np.frombuffer(passed_col, dtype=np.int8).astype(bool)
+        table.login = np.frombuffer(login_col, dtype=np.int8).astype(bool)
+        table.duration = np.frombuffer(duration_col, dtype=np.float64) if duration_col else np.zeros(0)
+        table.decided_by = np.frombuffer(decided_col, dtype=np.int32) if decided_col else np.zeros(0, np.int32)
+        table.message_row = np.frombuffer(msg_row, dtype=np.int32) if msg_row else np.zeros(0, np.int32)
+        table.message = np.frombuffer(msg_col, dtype=np.int32) if msg_col else np.zeros(0, np.int32)
+        table.run_day = np.array(days, dtype="datetime64[D]")
+        if last is not None:
+            table = table.last_runs(last)
+        return table
+
+    @classmethod
+    def from_stores(cls, filenames, last=None):
+        def runs():
+            for filename in filenames:
+                yield from iter_runs(filename)
+        return cls.from_runs(runs(), last=last)
+
+    def last_runs(self, count):
+        """Rows of the most recent `count` runs only."""
+        if not len(self.run_day):
+            return self
+        first = max(0, len(self.run_day) - count)
+        keep = self.run >= first
+        table = AttemptTable()
+        table.labels, table.messages, table.decided_by_values = self.labels, self.messages, self.decided_by_values
+        for name in ("run", "label", "passed", "login", "duration", "decided_by"):
+            setattr(table, name, getattr(self, name)[keep])
+        table.run = table.run - first
+        remap = np.cumsum(keep) - 1
+        msg_keep = keep[self.message_row]
+        table.message_row = remap[self.message_row[msg_keep]].astype(np.int32)
+        table.message = self.message[msg_keep]
+        table.run_day = self.run_day[first:]
+        return table
+
+
+def pass_rates(table):
+    """Per label: attempts, pass rate and logic-failure rate."""
+    n = len(table.labels)
+    total = np.bincount(table.label, minlength=n)
+    passed = np.bincount(table.label, weights=table.passed, minlength=n)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rate = passed / total
+    return [
+        {"label": table.labels[i], "attempts": int(total[i]),
+         "pass_rate": float(rate[i]), "logic_failure_rate": float(1 - rate[i])}
+        for i in np.argsort(rate, kind="stable") if total[i]
+    ]
+
+
+def failure_histogram(table, top=10):
+    """Most frequent (number-normalized) error messages on failed logins."""
+    failed = ~table.login[table.message_row]
+    counts = np.bincount(table.message[failed], minlength=len(table.messages))
+    order = np.argsort(-counts, kind="stable")[:top]
+    return [{"message": table.messages[i], "count": int(counts[i])} for i in order if counts[i]]
+
+
+def flakiness(table):
+    """Per label: share of consecutive runs whose verdict flipped.
+
+    0 means the label always passes or always fails; 1 means it alternates
+    on every run. Labels that ran in fewer than two runs are left out.
+    """
+    order = np.lexsort((table.run, table.label))
+    label, passed = table.label[order], table.passed[order]
+    same = label[1:] == label[:-1]
+    flips = (passed[1:] != passed[:-1]) & same
+    n = len(table.labels)
+    flip_count = np.bincount(label[1:][same], weights=flips[same], minlength=n)
+    pairs = np.bincount(label[1:][same], minlength=n)
+    return sorted((
+        {"label": table.labels[i], "runs": int(pairs[i] + 1), "flakiness": float(flip_count[i] / pairs[i])}
+        for i in range(n) if pairs[i]
+    ), key=lambda r: -r["flakiness"])
+
+
+def latency_percentiles(table, by="label", q=PERCENTILES):
+    """Attempt duration percentiles (seconds) grouped by "label" or "day"."""
+    if by == "day":
+        days, day_codes = np.unique(table.run_day, return_inverse=True)
+        groups, names = day_codes[table.run], days.astype(str)
+    else:
+        groups, names = table.label, np.array(table.labels, dtype=object)
+    valid = ~np.isnan(table.duration)
+    groups, durations = groups[valid], table.duration[valid]
+    order = np.argsort(groups, kind="stable")
+    groups, durations = groups[order], durations[order]
+    bounds = np.flatnonzero(np.diff(groups)) + 1
+    rows = []
+    for chunk_groups, chunk in zip(np.split(groups, bounds), np.split(durations, bounds)):
+        if not len(chunk):
+            continue
+        values = np.percentile(chunk, q)
+        row = {by: str(names[chunk_groups[0]]), "count": int(len(chunk))}
+        row.update({f"p{p}": round(float(v), 3) for p, v in zip(q, values)})
+        rows.append(row)
+    return rows
+
+
+def _markdown_table(rows, columns):
+    if not rows:
+        return "_no data_\n"
+    lines = ["| " + " | ".join(columns) + " |", "|" + "---|" * len(columns)]
+    for row in rows:
+        lines.append("| " + " | ".join(str(row[c]) for c in columns) + " |")
+    return "\n".join(lines) + "\n"
+
+
+def render_report(table, top=10):
+    """Static Markdown report of pass rates, failures, flakiness and latency."""
+    def pct(rows, *fields):
+        return [dict(r, **{f: f"{r[f]:.1%}" for f in fields}) for r in rows]
+
+    runs = len(table.run_day)
+    out = [
+        "# Results report\n",
+        f"{len(table)} attempts in {runs} runs"
+        + (f" ({table.run_day.min()} – {table.run_day.max()})" if runs else "") + "\n",
+        "## Pass rate by label\n",
+        _markdown_table(pct(pass_rates(table), "pass_rate", "logic_failure_rate"),
+                        ["label", "attempts", "pass_rate", "logic_failure_rate"]),
+        "## Most frequent failure messages\n",
+        _markdown_table(failure_histogram(table, top), ["message", "count"]),
+        "## Flakiness by label\n",
+        _markdown_table(pct(flakiness(table), "flakiness"), ["label", "runs", "flakiness"]),
+    ]
+    percentile_columns = [f"p{p}" for p in PERCENTILES]
+    for by in ("label", "day"):
+        out += [f"## Attempt duration by {by} (s)\n",
+                _markdown_table(latency_percentiles(table, by), [by, "count"] + percentile_columns)]
+    return "\n".join(out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analytics report over result stores.")
+    parser.add_argument("stores", nargs="+", help=".jsonl (or legacy .json) result stores")
+    parser.add_argument("--last", type=int, default=None, help="only the most recent N runs")
+    parser.add_argument("--top", type=int, default=10, help="failure messages to list")
+    parser.add_argument("--out", default=None, help="write the Markdown report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    table = AttemptTable.from_stores(args.stores, last=args.last)
+    report = render_report(table, top=args.top)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(report)
+        print(f"Report written to {args.out}")
+    else:
+        print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
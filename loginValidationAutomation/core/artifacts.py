@@ -0,0 +1,110 @@
+import hashlib
+import json
+import os
+import queue
+import threading
+
+ARTIFACT_DIR = "results/artifacts"
+
+
+class ArtifactWriter:
+    """Writes failure artifacts on a background thread.
+
+    `submit()` hashes the bytes on the caller's thread and returns the
+    artifact's path right away; the disk write happens on the writer
+    thread. Artifacts are stored once per content hash
+    (`<root>/<hash[:2]>/<hash>.<ext>`), so identical screenshots or DOM
+    dumps cost one file. The queue holds at most `maxsize` pending writes;
+    when it is full the artifact is dropped (and counted) rather than
+    stalling the browser loop.
+    """
+
+    def __init__(self, root=ARTIFACT_DIR, maxsize=32):
+        self.root = root
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._seen = set()
+        self._lock = threading.Lock()
+        self.written = self.deduplicated = self.dropped = self.bytes_written = 0
+        self._thread = threading.Thread(target=self._loop, name="artifact-writer", daemon=True)
+        self._thread.start()
+
+    def _path(self, digest, ext):
+        return os.path.join(self.root, digest[:2], f"{digest}.{ext}")
+
+    def submit(self, data, ext):
+        """Queue `data` (bytes or str) for writing; returns its path, or None
+        if the queue was full and the artifact was dropped."""
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest, ext)
+        with self._lock:
+            if digest in self._seen or os.path.exists(path):
+                self._seen.add(digest)
+                self.deduplicated += 1
+                return path
+            try:
+                self._queue.put_nowait((path, data))
+            except queue.Full:
+                self.dropped += 1
+                return None
+            self._seen.add(digest)
+        return path
+
+    def _loop(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                path, data = item
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp = f"{path}.tmp{os.getpid()}"
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+                with self._lock:
+                    self.written += 1
+                    self.bytes_written += len(data)
+            except OSError as e:
+                print(f"⚠️ Could not write artifact {item[0]}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """Block until every queued artifact is on disk."""
+        self._queue.join()
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "written": self.written,
+                "deduplicated": self.deduplicated,
+                "dropped": self.dropped,
+                "bytes": self.bytes_written,
+            }
+
+
+def capture_browser(driver, writer):
+    """Screenshot, page source and console log of the current page.
+
+    Only the WebDriver reads run on the calling thread; returns
+    {"screenshot", "page_source", "console"} paths (None where a capture
+    failed or was dropped).
+    """
+    refs = {}
+    captures = (
+        ("screenshot", "png", lambda: driver.get_screenshot_as_png()),
+        ("page_source", "html", lambda: driver.page_source),
+        ("console", "json", lambda: json.dumps(driver.get_log("browser"), indent=2)),
+    )
+    for name, ext, read in captures:
+        try:
+            refs[name] = writer.submit(read(), ext)
+        except Exception:
+            refs[name] = None
+    return refs
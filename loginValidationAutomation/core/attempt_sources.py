@@ -0,0 +1,83 @@
+import csv
+import itertools
+import json
+import os
+
+# Columns/keys holding booleans in attempt files.
+BOOL_FIELDS = ("expected_login",)
+_TRUE = ("1", "true", "yes", "y")
+
+
+def _coerce(row):
+    row = {k: v for k, v in row.items() if k is not None}
+    for field in BOOL_FIELDS:
+        value = row.get(field)
+        if isinstance(value, str):
+            row[field] = value.strip().lower() in _TRUE
+    return row
+
+
+def read_csv(path):
+    """Yield one attempt dict per CSV row (header = attribute names)."""
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            yield _coerce(row)
+
+
+def read_jsonl(path):
+    """Yield one attempt dict per non-empty JSON line."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield _coerce(json.loads(line))
+
+
+READERS = {".csv": read_csv, ".jsonl": read_jsonl}
+
+
+def iter_attempts(source):
+    """Fresh lazy iterator over `source`: a .csv/.jsonl path, a callable
+    returning an iterable (e.g. a generator function), or an iterable.
+
+    Paths and callables are re-read on every call, so a test can be run
+    more than once; a plain iterator can only be consumed once.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        ext = os.path.splitext(os.fspath(source))[1].lower()
+        if ext not in READERS:
+            raise ValueError(f"Unsupported attempt file {source!r}; expected one of {sorted(READERS)}")
+        return READERS[ext](source)
+    if callable(source):
+        return iter(source())
+    return iter(source)
+
+
+def email_variants(email, unknown_domain="example.invalid"):
+    """Named spellings of one account's email for negative/normalization cases."""
+    local = email.split("@", 1)[0]
+    return {
+        "exact": email,
+        "upper": email.upper(),
+        "padded": f"  {email}  ",
+        "unknown": f"{local}@{unknown_domain}",
+    }
+
+
+def matrix(emails, passwords, expected, label="{email} email + {password} password"):
+    """Lazily yield the cross product emails × passwords as attempts.
+
+    `emails` and `passwords` map a class name to a value; `expected(email_class,
+    password_class)` returns the expected login outcome, or None to leave the
+    combination out. Nothing is materialized, so huge matrices stream.
+    """
+    for (e_name, email), (p_name, password) in itertools.product(emails.items(), passwords.items()):
+        outcome = expected(e_name, p_name)
+        if outcome is None:
+            continue
+        yield {
+            "label": label.format(email=e_name, password=p_name),
+            "email": email,
+            "password": password,
+            "expected_login": bool(outcome),
+        }
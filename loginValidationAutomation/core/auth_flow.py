@@ -1,17 +1,205 @@
+from urllib.parse import urljoin
+
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
+
+from core.artifacts import capture_browser
+from core.dom_waiter import DomWaiter, build_wait_script
+from core import network_verdict
+from core.locators import LocatorCache, RESOLVE_LOCATORS_FN, RESOLVE_LOCATORS_JS, page_key
+from core.page_snapshot import OTP_INPUT_CSS, SNAPSHOT_FN, take_snapshot
+from core.timing import StepTimer
+
+LOGIN_ERROR_XPATH = (
+    "//*[contains(text(), 'Invalid') or contains(text(), 'Incorrect') or contains(text(), 'locked')]"
+)
+OTP_ERROR_XPATH = (
+    "//*[contains(text(), 'Invalid') or contains(text(), 'Incorrect') or contains(text(), 'expired') or contains(text(), 'OTP')]"
+)
+# Narrower than OTP_ERROR_XPATH: static labels such as "OTP Code" must not decide a verdict.
+OTP_VERDICT_XPATH = (
+    "//*[contains(text(), 'Invalid') or contains(text(), 'Incorrect') or contains(text(), 'expired')]"
+)
+FORGOT_ERROR_XPATH = (
+    "//*[contains(text(), 'Invalid') or contains(text(), 'not found') or contains(text(), 'email')]"
+)
+FORGOT_VERDICT_XPATH = "//*[contains(text(), 'Invalid') or contains(text(), 'not found')]"
+
+LOGIN_EMAIL_LOCATORS = [
+    (By.NAME, "email"),
+    (By.ID, "email"),
+    (By.CSS_SELECTOR, "input[type='email']"),
+]
+LOGIN_PASSWORD_LOCATORS = [
+    (By.NAME, "password"),
+    (By.ID, "password"),
+    (By.CSS_SELECTOR, "input[type='password']"),
+]
+LOGIN_SUBMIT_LOCATORS = [
+    (By.XPATH, "//button[@type='submit']"),
+    (By.CSS_SELECTOR, "button[type='submit']"),
+]
+
+# In-page conditions for DomWaiter (resolved on DOM mutation / URL change).
+OUTCOME_WAIT_JS = build_wait_script("""
+const s = pageSnapshot(args.error_xpath, args.verdict_xpath, args.otp_css);
+if (s.url !== args.original_url || (args.success_url && s.url.startsWith(args.success_url)))
+  return {decided_by: 'redirect', snapshot: s};
+if (args.watch_otp && s.otp.count) return {decided_by: 'otp_screen', snapshot: s};
+if (s.verdict_errors.some(t => !args.baseline.includes(t))) return {decided_by: 'error_message', snapshot: s};
+return null;
+""", helpers=SNAPSHOT_FN)
+
+OTP_READY_WAIT_JS = build_wait_script("""
+const s = pageSnapshot(null, null, args.otp_css);
+if (args.url_fragment && !s.url.includes(args.url_fragment)) return null;
+return s.otp.count >= args.count && s.otp.enabled ? s : null;
+""", helpers=SNAPSHOT_FN)
+
+OTP_INPUTS_WAIT_JS = build_wait_script("""
+const inputs = Array.from(document.querySelectorAll(args.otp_css));
+return inputs.length >= args.count ? inputs : null;
+""")
+
+VISIBLE_LOCATOR_WAIT_JS = build_wait_script(
+    "return resolveLocators(args.locators, true);", helpers=RESOLVE_LOCATORS_FN
+)
+
+# The OTP scripts take the located input elements as arguments[0], so the
+# fill, clear and read-back all act on the same boxes without re-querying.
+OTP_JS_FILL = (
+    "const inputs = Array.from(arguments[0]);"
+    "const otp = arguments[1];"
+    "const setter = Object.getOwnPropertyDescriptor(window.HTMLInputElement.prototype, 'value').set;"
+    "inputs.forEach((el, i) => {"
+    "  if (i >= otp.length) return;"
+    "  setter.call(el, otp[i]);"
+    "  el.dispatchEvent(new Event('input', {bubbles:true}));"
+    "  el.dispatchEvent(new Event('change', {bubbles:true}));"
+    "});"
+    "return inputs.map(el => el.value);"
+)
+OTP_JS_CLEAR = (
+    "const setter = Object.getOwnPropertyDescriptor(window.HTMLInputElement.prototype, 'value').set;"
+    "Array.from(arguments[0]).forEach(el => {"
+    "  setter.call(el, '');"
+    "  el.dispatchEvent(new Event('input', {bubbles:true}));"
+    "});"
+)
+OTP_JS_READ = "return Array.from(arguments[0]).map(el => el.value);"
+
+STORAGE_READ_JS = (
+    "const dump = s => { const out = {}; for (let i = 0; i < s.length; i++) {"
+    "  const k = s.key(i); out[k] = s.getItem(k); } return out; };"
+    "return {local: dump(window.localStorage), session: dump(window.sessionStorage)};"
+)
+STORAGE_WRITE_JS = (
+    "const fill = (s, data) => { s.clear(); Object.entries(data || {}).forEach(([k, v]) => s.setItem(k, v)); };"
+    "fill(window.localStorage, arguments[0]); fill(window.sessionStorage, arguments[1]);"
+)
+
+# Same-page attempts: if the login form is still loaded and usable, clear the
+# fields and mark the current error banners stale (data-qa-stale holds the
+# text; pageSnapshot skips a node while its text is unchanged) and return the
+# [index, element] matches for email, password and submit. null → navigate.
+LOGIN_FORM_RESET_JS = RESOLVE_LOCATORS_FN + """
+const [pageKey, emailLocs, passwordLocs, submitLocs, errorXPath] = arguments;
+if (document.readyState !== 'complete') return null;
+if (window.location.protocol + '//' + window.location.host + window.location.pathname !== pageKey) return null;
+const email = resolveLocators(emailLocs, true);
+const password = resolveLocators(passwordLocs, false);
+const submit = resolveLocators(submitLocs, false);
+if (!email || !password || !submit) return null;
+if ([email[1], password[1], submit[1]].some(el => el.disabled || el.readOnly)) return null;
+const setter = Object.getOwnPropertyDescriptor(window.HTMLInputElement.prototype, 'value').set;
+[email[1], password[1]].forEach(el => {
+  setter.call(el, '');
+  el.dispatchEvent(new Event('input', {bubbles:true}));
+  el.dispatchEvent(new Event('change', {bubbles:true}));
+});
+const snap = document.evaluate(errorXPath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+for (let i = 0; i < snap.snapshotLength; i++) {
+  const el = snap.snapshotItem(i);
+  el.setAttribute('data-qa-stale', el.innerText || '');
+}
+return [email, password, submit];
+"""
+CLEAR_STALE_JS = (
+    "document.querySelectorAll('[data-qa-stale]').forEach(el => el.removeAttribute('data-qa-stale'));"
+)
+
+REDIRECT_WAIT_JS = build_wait_script("""
+return window.location.href !== args.original_url ? window.location.href : null;
+""")
+
+
+def _cdp_cookie(cookie):
+    """Selenium cookie dict → CDP Network.CookieParam."""
+    param = {k: v for k, v in cookie.items() if k != "expiry"}
+    if "expiry" in cookie:
+        param["expires"] = cookie["expiry"]
+    return param
 
 
 class AuthFlow:
     """Reusable authentication logic. Accepts all inputs from tests."""
 
-    def __init__(self, driver, wait_timeout=10, dashboard_wait=3):
+    OTP_FILL_STRATEGIES = ("js_setter", "per_box", "first_box")
+
+    def __init__(self, driver, wait_timeout=10, dashboard_wait=3, locator_cache=None,
+                 network_verdicts=None, same_page=False):
         self.driver = driver
         self.wait_timeout = wait_timeout
         self.dashboard_wait = dashboard_wait
-        self.wait = WebDriverWait(driver, wait_timeout)
+        self.waiter = DomWaiter(driver)
+        self.locator_cache = locator_cache or LocatorCache()
+        self.timer = StepTimer()
+        if network_verdicts is None:
+            network_verdicts = network_verdict.enabled()
+        self.network = network_verdict.NetworkVerdictReader(driver) if network_verdicts else None
+        self._network_unmatched = set()
+        self._otp_fill_strategy = {}
+        self.last_otp_fill = None
+        self.same_page = same_page
+
+    def open(self, url):
+        self.driver.get(url)
+
+    def capture_state(self):
+        """Checkpoint of the browser state: URL, cookies and web storage."""
+        storage = self.driver.execute_script(STORAGE_READ_JS)
+        return {
+            "url": self.driver.current_url,
+            "cookies": self.driver.get_cookies(),
+            "local_storage": storage["local"],
+            "session_storage": storage["session"],
+        }
+
+    def restore_state(self, state):
+        """Re-enter a checkpoint in this session; True once the URL is reached."""
+        try:
+            self.driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            self.driver.execute_cdp_cmd("Network.setCookies", {"cookies": [
+                _cdp_cookie(c) for c in state["cookies"]
+            ]})
+            self.driver.get(state["url"])
+        except Exception:
+            # No CDP: cookies can only be added for the origin currently loaded.
+            self.driver.get(state["url"])
+            self.driver.delete_all_cookies()
+            for cookie in state["cookies"]:
+                self.driver.add_cookie(cookie)
+            self.driver.get(state["url"])
+        if state["local_storage"] or state["session_storage"]:
+            self.driver.execute_script(
+                STORAGE_WRITE_JS, state["local_storage"], state["session_storage"]
+            )
+            self.driver.refresh()
+        return self.driver.current_url == state["url"]
+
+    def capture_artifacts(self, writer):
+        """Hand screenshot, page source and console log to an ArtifactWriter."""
+        return capture_browser(self.driver, writer)
 
     def _type_input(self, element, value):
         try:
@@ -26,76 +214,191 @@ class AuthFlow:
             element.clear()
             element.send_keys(value)
 
+    def _resolve(self, locators, visible_only):
+        """One round trip: first match across all candidates, or None."""
+        match = self.driver.execute_script(
+            RESOLVE_LOCATORS_JS, [list(loc) for loc in locators], visible_only
+        )
+        if not match:
+            return None
+        return locators[match[0]], match[1]
+
     def _first_present(self, locators):
-        for locator in locators:
-            try:
-                return self.driver.find_element(*locator)
-            except NoSuchElementException:
-                continue
-        raise NoSuchElementException("No element found for provided locators")
+        url = self.driver.current_url
+        ordered = self.locator_cache.order(url, locators)
+        match = self._resolve(ordered, visible_only=False)
+        if match is None:
+            raise NoSuchElementException("No element found for provided locators")
+        self.locator_cache.record(url, locators, match[0])
+        return match[1]
 
     def _first_visible(self, locators):
-        for locator in locators:
-            try:
-                return self.wait.until(EC.visibility_of_element_located(locator))
-            except TimeoutException:
-                continue
-        raise TimeoutException("No visible element found for provided locators")
+        """Single wait that re-checks every candidate on each DOM change."""
+        url = self.driver.current_url
+        ordered = self.locator_cache.order(url, locators)
+        match = self.waiter.until(
+            VISIBLE_LOCATOR_WAIT_JS, {"locators": [list(loc) for loc in ordered]}, self.wait_timeout
+        )
+        if not match:
+            raise TimeoutException("No visible element found for provided locators")
+        winner, element = ordered[match[0]], match[1]
+        self.locator_cache.record(url, locators, winner)
+        return element
 
     def _wait_for_redirect(self, original_url, timeout=5):
+        url = self.waiter.until(REDIRECT_WAIT_JS, {"original_url": original_url}, timeout)
+        return url or self.driver.current_url
+
+    def snapshot(self, error_xpath=None, verdict_xpath=None):
+        """URL, error texts, lock flag and OTP input state in one round trip."""
+        return take_snapshot(self.driver, error_xpath, verdict_xpath)
+
+    def _error_texts(self, xpath):
+        return self.snapshot(xpath)["errors"]
+
+    def _network_arm(self):
+        if self.network is not None:
+            self.network.drain()
+
+    def _network_result(self, step, page_url, timeout=5):
+        """Verdict from the auth API response (network mode), or None to fall
+        back to DOM-based detection. A step whose API call never shows up is
+        not waited on again, so a pattern mismatch costs one timeout only."""
+        if self.network is None or step in self._network_unmatched:
+            return None
+        response = self.network.wait_for_response(step, timeout)
+        if response is None:
+            self._network_unmatched.add(step)
+            return None
+        status = response["status"] or 0
+        ok = 200 <= status < 300
+        message = response["message"] if isinstance(response["message"], str) else ""
+        body = response["body"] if isinstance(response["body"], dict) else {}
+        redirect = body.get("redirect")
+        return {
+            "ok": ok,
+            "errors": [message] if message and not ok else [],
+            "url": urljoin(page_url, redirect) if ok and redirect else self.driver.current_url,
+            "locked": status == 423 or "locked" in message.lower(),
+            "decided_by": f"network_{status}",
+        }
+
+    def _wait_for_outcome(self, original_url, error_xpath, verdict_xpath=None, baseline=(),
+                          timeout=5, success_url=None, watch_otp=False):
+        """Wait until the first deciding condition fires, instead of always
+        sitting out the redirect timeout on negative cases.
+
+        Resolves inside the page on the first DOM mutation or URL change that
+        decides the attempt. Returns (snapshot, decided_by) where decided_by
+        is one of "redirect", "error_message", "otp_screen" or "timeout".
+        Verdict messages in `baseline` (already on the page before submit)
+        are ignored.
+        """
+        outcome = self.waiter.until(OUTCOME_WAIT_JS, {
+            "original_url": original_url,
+            "success_url": success_url,
+            "error_xpath": error_xpath,
+            "verdict_xpath": verdict_xpath,
+            "otp_css": OTP_INPUT_CSS,
+            "watch_otp": watch_otp,
+            "baseline": list(baseline),
+        }, timeout)
+        if outcome:
+            return outcome["snapshot"], outcome["decided_by"]
+        return self.snapshot(error_xpath, verdict_xpath), "timeout"
+
+    def wait_for_otp_ready(self, url_fragment=None, count=6, timeout=None):
+        """Wait until the OTP inputs are rendered and enabled (optionally on a URL)."""
+        snap = self.waiter.until(OTP_READY_WAIT_JS, {
+            "url_fragment": url_fragment, "count": count, "otp_css": OTP_INPUT_CSS,
+        }, timeout or self.wait_timeout)
+        if not snap:
+            raise TimeoutException("OTP inputs not ready")
+        return snap
+
+    def _reset_login_form(self, login_url):
+        """Reuse the login form still loaded from the previous attempt.
+
+        Returns (email, password, submit) with the fields cleared and old
+        error banners marked stale, or None when the page was left (redirect,
+        OTP screen) or is not usable, in which case the caller navigates.
+        """
+        candidates = (LOGIN_EMAIL_LOCATORS, LOGIN_PASSWORD_LOCATORS, LOGIN_SUBMIT_LOCATORS)
+        ordered = [self.locator_cache.order(login_url, locators) for locators in candidates]
         try:
-            WebDriverWait(self.driver, timeout).until(
-                lambda d: d.current_url != original_url
+            match = self.driver.execute_script(
+                LOGIN_FORM_RESET_JS, page_key(login_url),
+                *[[list(loc) for loc in locators] for locators in ordered], LOGIN_ERROR_XPATH,
             )
-            return self.driver.current_url
-        except TimeoutException:
-            return self.driver.current_url
+        except WebDriverException:
+            return None
+        if not match:
+            return None
+        elements = []
+        for locators, order, (index, element) in zip(candidates, ordered, match):
+            self.locator_cache.record(login_url, locators, order[index])
+            elements.append(element)
+        return elements
 
     def run_login_attempt(self, login_url, attempt):
-        self.driver.get(login_url)
+        """Returns (result, locked); result["timings"] holds per-step seconds.
+
+        With `same_page`, an attempt that starts on the still-usable login
+        form resets it in place (span "reset") instead of reloading the page.
+        If such an attempt sees no outcome before the timeout, the app does
+        not re-render identical errors, so same-page mode is switched off.
+        """
+        timer = self.timer
+        timer.reset()
+        fields = None
+        if self.same_page:
+            with timer.span("reset"):
+                fields = self._reset_login_form(login_url)
         try:
-            email_locators = [
-                (By.NAME, "email"),
-                (By.ID, "email"),
-                (By.CSS_SELECTOR, "input[type='email']"),
-            ]
-            password_locators = [
-                (By.NAME, "password"),
-                (By.ID, "password"),
-                (By.CSS_SELECTOR, "input[type='password']"),
-            ]
-            submit_locators = [
-                (By.XPATH, "//button[@type='submit']"),
-                (By.CSS_SELECTOR, "button[type='submit']"),
-            ]
-
-            email_input = self._first_visible(email_locators)
-            password_input = self._first_present(password_locators)
-            submit_btn = self._first_present(submit_locators)
-
-            self._type_input(email_input, attempt["email"])
-            self._type_input(password_input, attempt["password"])
-            submit_btn.click()
-
-            final_url = self._wait_for_redirect(login_url, timeout=5)
-
-            error_elements = self.driver.find_elements(
-                By.XPATH,
-                "//*[contains(text(), 'Invalid') or contains(text(), 'Incorrect') or contains(text(), 'locked')]"
-            )
-            errors = [el.text for el in error_elements if el.text.strip()]
-
-            login_success = (
-                final_url != login_url
-                and not any("locked" in e.lower() for e in errors)
-            )
+            if fields:
+                email_input, password_input, submit_btn = fields
+            else:
+                with timer.span("navigate"):
+                    self.driver.get(login_url)
+                with timer.span("locate"):
+                    email_input = self._first_visible(LOGIN_EMAIL_LOCATORS)
+                    password_input = self._first_present(LOGIN_PASSWORD_LOCATORS)
+                    submit_btn = self._first_present(LOGIN_SUBMIT_LOCATORS)
+
+            with timer.span("type"):
+                self._type_input(email_input, attempt["email"])
+                self._type_input(password_input, attempt["password"])
+            baseline = self._error_texts(LOGIN_ERROR_XPATH)
+            self._network_arm()
+            with timer.span("click"):
+                submit_btn.click()
+
+            with timer.span("outcome"):
+                net = self._network_result("login", login_url)
+                if net:
+                    final_url, errors, locked = net["url"], net["errors"], net["locked"]
+                    decided_by = net["decided_by"]
+                    login_success = net["ok"] and not locked
+                else:
+                    snap, decided_by = self._wait_for_outcome(
+                        login_url, LOGIN_ERROR_XPATH, baseline=baseline, timeout=5, watch_otp=True
+                    )
+                    if fields and decided_by == "timeout":
+                        self.same_page = False
+                        self.driver.execute_script(CLEAR_STALE_JS)
+                        snap = self.snapshot(LOGIN_ERROR_XPATH)
+                    final_url = snap["url"]
+                    errors = snap["errors"]
+                    locked = snap["locked"]
+                    login_success = final_url != login_url and not locked
 
             result = {
                 "login_success": login_success,
                 "error_messages": errors,
                 "url": final_url,
+                "decided_by": decided_by,
+                "timings": timer.as_dict(),
             }
-            locked = any("locked" in e.lower() for e in errors)
             return result, locked
 
         except (NoSuchElementException, TimeoutException) as e:
@@ -103,13 +406,12 @@ class AuthFlow:
                 "login_success": False,
                 "error_messages": [str(e)],
                 "url": self.driver.current_url,
+                "timings": timer.as_dict(),
             }
             return result, False
 
     def _find_otp_inputs(self):
-        inputs = self.driver.find_elements(
-            By.CSS_SELECTOR, "input[aria-label^='Please enter OTP character' i]"
-        )
+        inputs = self.driver.find_elements(By.CSS_SELECTOR, OTP_INPUT_CSS)
         if inputs:
             return inputs
         inputs = self.driver.find_elements(
@@ -120,61 +422,72 @@ class AuthFlow:
         raise NoSuchElementException("No OTP input elements found")
 
     def _wait_for_otp_inputs(self, count=6):
-        def _ready(d):
-            inputs = d.find_elements(By.CSS_SELECTOR, "input[aria-label^='Please enter OTP character' i]")
-            return inputs if len(inputs) >= count else False
-        return self.wait.until(_ready)
+        inputs = self.waiter.until(
+            OTP_INPUTS_WAIT_JS, {"count": count, "otp_css": OTP_INPUT_CSS}, self.wait_timeout
+        )
+        if not inputs:
+            raise TimeoutException("OTP inputs not found")
+        return inputs
+
+    def _otp_fill_js_setter(self, otp_inputs, otp_str):
+        # Native value setter + input/change events; returns values for verification.
+        return self.driver.execute_script(OTP_JS_FILL, otp_inputs, otp_str)
+
+    def _otp_fill_per_box(self, otp_inputs, otp_str):
+        for el, ch in zip(otp_inputs, otp_str):
+            el.send_keys(ch)
+        return None
+
+    def _otp_fill_first_box(self, otp_inputs, otp_str):
+        # For widgets that auto-advance focus to the next box.
+        otp_inputs[0].send_keys(otp_str)
+        return None
 
     def _fill_otp_inputs(self, otp_inputs, otp_value):
+        """Try fill strategies in order, verify each with one read-back call,
+        and stop at the first that works. The winning strategy is remembered
+        per page and tried first next time."""
         otp_str = str(otp_value)
-        # JS fill by selector (preferred)
-        try:
-            values = self.driver.execute_script(
-                "const otp = arguments[0];"
-                "const inputs = Array.from(document.querySelectorAll(\"input[aria-label^='Please enter OTP character' i]\"));"
-                "const setter = Object.getOwnPropertyDescriptor(window.HTMLInputElement.prototype, 'value').set;"
-                "inputs.forEach((el, i) => {"
-                "  if (i >= otp.length) return;"
-                "  setter.call(el, otp[i]);"
-                "  el.dispatchEvent(new Event('input', {bubbles:true}));"
-                "  el.dispatchEvent(new Event('change', {bubbles:true}));"
-                "});"
-                "return inputs.map(el => el.value);",
-                otp_str
-            )
-            expected = list(otp_str)[:len(values)]
-            if values[:len(expected)] == expected:
-                return otp_inputs
-        except Exception:
-            pass
-
-        # Fallback to direct typing per box
-        for idx, ch in enumerate(otp_str):
-            if idx >= len(otp_inputs):
-                break
+        key = page_key(self.driver.current_url)
+        remembered = self._otp_fill_strategy.get(key)
+        order = list(self.OTP_FILL_STRATEGIES)
+        if remembered in order:
+            order.remove(remembered)
+            order.insert(0, remembered)
+
+        for n, name in enumerate(order):
             try:
-                otp_inputs[idx].click()
-                otp_inputs[idx].send_keys(ch)
+                if n > 0:
+                    self.driver.execute_script(OTP_JS_CLEAR, otp_inputs)
+                values = getattr(self, f"_otp_fill_{name}")(otp_inputs, otp_str)
+                if values is None:
+                    values = self.driver.execute_script(OTP_JS_READ, otp_inputs)
             except Exception:
-                pass
-
-        # Final fallback: type full OTP into first box
-        try:
-            otp_inputs[0].click()
-            otp_inputs[0].send_keys(otp_str)
-        except Exception:
-            pass
+                continue
+            expected = list(otp_str)[:len(values)]
+            if values and values[:len(expected)] == expected:
+                self._otp_fill_strategy[key] = name
+                self.last_otp_fill = {"strategy": name, "verified": True}
+                return otp_inputs
 
+        self.last_otp_fill = {"strategy": None, "verified": False}
         return otp_inputs
 
     class OTPFlow:
-        def __init__(self, driver, wait, find_inputs_fn, fill_fn, submit_btn_fn, wait_redirect_fn):
+        def __init__(self, driver, waiter, find_inputs_fn, fill_fn, submit_btn_fn, wait_outcome_fn,
+                     error_texts_fn, timer=None, network_arm_fn=None, network_result_fn=None):
             self.driver = driver
-            self.wait = wait
+            self.timer = timer or StepTimer()
+            self.last_timings = None
+            self.waiter = waiter
             self._find_inputs = find_inputs_fn
             self._fill_inputs = fill_fn
             self._submit_btn = submit_btn_fn
-            self._wait_redirect = wait_redirect_fn
+            self._wait_outcome = wait_outcome_fn
+            self._error_texts = error_texts_fn
+            self.last_decided_by = None
+            self._network_arm = network_arm_fn or (lambda: None)
+            self._network_result = network_result_fn or (lambda step, page_url: None)
 
         def fill(self, otp_value):
             otp_inputs = self._find_inputs()
@@ -185,11 +498,27 @@ class AuthFlow:
             self._submit_btn().click()
 
         def fill_and_submit(self, otp_value, success_url=None):
+            timer = self.timer
+            timer.reset()
             original_url = self.driver.current_url
-            self.fill(otp_value)
-            self.submit()
-            final_url = self._wait_redirect(original_url, timeout=5)
-            success = (final_url != original_url) or (success_url and final_url.startswith(success_url))
+            with timer.span("fill"):
+                self.fill(otp_value)
+            baseline = self._error_texts(OTP_VERDICT_XPATH)
+            self._network_arm()
+            with timer.span("click"):
+                self.submit()
+            with timer.span("outcome"):
+                net = self._network_result("verify_otp", original_url)
+                if net:
+                    self.last_decided_by = net["decided_by"]
+                    self.last_timings = timer.as_dict()
+                    return net["url"], bool(net["ok"])
+                snap, self.last_decided_by = self._wait_outcome(
+                    original_url, OTP_VERDICT_XPATH, baseline=baseline, timeout=5, success_url=success_url
+                )
+            self.last_timings = timer.as_dict()
+            final_url = snap["url"]
+            success = final_url != original_url or bool(success_url and final_url.startswith(success_url))
             return final_url, success
 
     def otp_flow(self):
@@ -200,62 +529,79 @@ class AuthFlow:
             ])
         return AuthFlow.OTPFlow(
             self.driver,
-            self.wait,
+            self.waiter,
             self._find_otp_inputs,
             self._fill_otp_inputs,
             submit_btn,
-            self._wait_for_redirect,
+            self._wait_for_outcome,
+            self._error_texts,
+            StepTimer(),
+            self._network_arm,
+            self._network_result,
         )
 
     def run_otp_attempt_on_current_page(self, otp_value, success_url=None):
+        timer = self.timer
+        timer.reset()
         original_url = self.driver.current_url
         try:
-            otp_inputs = self._wait_for_otp_inputs()
-            self._fill_otp_inputs(otp_inputs, otp_value)
-
-            submit_btn = self._first_present([
-                (By.XPATH, "//button[@type='submit']"),
-                (By.CSS_SELECTOR, "button[type='submit']"),
-            ])
-            submit_btn.click()
-
-            final_url = self._wait_for_redirect(original_url, timeout=5)
-
-            error_elements = self.driver.find_elements(
-                By.XPATH,
-                "//*[contains(text(), 'Invalid') or contains(text(), 'Incorrect') or contains(text(), 'expired') or contains(text(), 'OTP')]"
-            )
-            errors = [el.text for el in error_elements if el.text.strip()]
-
-            otp_success = (
-                (final_url != original_url or (success_url and final_url.startswith(success_url)))
-                and not any("invalid" in e.lower() or "incorrect" in e.lower() for e in errors)
-            )
+            with timer.span("locate"):
+                otp_inputs = self._wait_for_otp_inputs()
+            with timer.span("fill"):
+                self._fill_otp_inputs(otp_inputs, otp_value)
+
+            with timer.span("locate"):
+                submit_btn = self._first_present([
+                    (By.XPATH, "//button[@type='submit']"),
+                    (By.CSS_SELECTOR, "button[type='submit']"),
+                ])
+            baseline = self._error_texts(OTP_VERDICT_XPATH)
+            self._network_arm()
+            with timer.span("click"):
+                submit_btn.click()
+
+            with timer.span("outcome"):
+                net = self._network_result("verify_otp", original_url)
+                if net:
+                    final_url, errors, decided_by = net["url"], net["errors"], net["decided_by"]
+                    otp_success = net["ok"]
+                else:
+                    snap, decided_by = self._wait_for_outcome(
+                        original_url, OTP_ERROR_XPATH, OTP_VERDICT_XPATH, baseline,
+                        timeout=5, success_url=success_url,
+                    )
+                    final_url = snap["url"]
+                    errors = snap["errors"]
+                    otp_success = (
+                        (final_url != original_url or bool(success_url and final_url.startswith(success_url)))
+                        and not any("invalid" in e.lower() or "incorrect" in e.lower() for e in errors)
+                    )
 
             return {
                 "login_success": otp_success,
                 "error_messages": errors,
                 "url": final_url,
+                "decided_by": decided_by,
+                "timings": timer.as_dict(),
             }
         except (NoSuchElementException, TimeoutException) as e:
             return {
                 "login_success": False,
                 "error_messages": [str(e)],
                 "url": self.driver.current_url,
+                "timings": timer.as_dict(),
             }
 
     def get_otp_errors_on_current_page(self):
-        error_elements = self.driver.find_elements(
-            By.XPATH,
-            "//*[contains(text(), 'Invalid') or contains(text(), 'Incorrect') or contains(text(), 'expired') or contains(text(), 'OTP')]"
-        )
-        return [el.text for el in error_elements if el.text.strip()]
+        return self._error_texts(OTP_ERROR_XPATH)
 
     def run_forgot_password_attempt_on_current_page(self, email_value):
         original_url = self.driver.current_url
         return self._run_forgot_password_attempt_on_page(original_url, email_value)
 
     def _run_forgot_password_attempt_on_page(self, original_url, email_value):
+        timer = self.timer
+        timer.reset()
         try:
             email_locators = [
                 (By.NAME, "email"),
@@ -267,26 +613,37 @@ class AuthFlow:
                 (By.CSS_SELECTOR, "button[type='submit']"),
             ]
 
-            email_input = self._first_visible(email_locators)
-            submit_btn = self._first_present(submit_locators)
-
-            self._type_input(email_input, email_value)
-            submit_btn.click()
-
-            final_url = self._wait_for_redirect(original_url, timeout=5)
-
-            error_elements = self.driver.find_elements(
-                By.XPATH,
-                "//*[contains(text(), 'Invalid') or contains(text(), 'not found') or contains(text(), 'email')]"
-            )
-            errors = [el.text for el in error_elements if el.text.strip()]
-
-            success = final_url != original_url
+            with timer.span("locate"):
+                email_input = self._first_visible(email_locators)
+                submit_btn = self._first_present(submit_locators)
+
+            with timer.span("type"):
+                self._type_input(email_input, email_value)
+            baseline = self._error_texts(FORGOT_VERDICT_XPATH)
+            self._network_arm()
+            with timer.span("click"):
+                submit_btn.click()
+
+            with timer.span("outcome"):
+                net = self._network_result("forgot_password", original_url)
+                if net:
+                    final_url, errors, decided_by = net["url"], net["errors"], net["decided_by"]
+                    success = net["ok"]
+                else:
+                    snap, decided_by = self._wait_for_outcome(
+                        original_url, FORGOT_ERROR_XPATH, FORGOT_VERDICT_XPATH, baseline,
+                        timeout=5, watch_otp=True,
+                    )
+                    final_url = snap["url"]
+                    errors = snap["errors"]
+                    success = final_url != original_url
 
             return {
                 "login_success": success,
                 "error_messages": errors,
                 "url": final_url,
+                "decided_by": decided_by,
+                "timings": timer.as_dict(),
             }
 
         except (NoSuchElementException, TimeoutException) as e:
@@ -294,4 +651,5 @@ class AuthFlow:
                 "login_success": False,
                 "error_messages": [str(e)],
                 "url": self.driver.current_url,
+                "timings": timer.as_dict(),
             }
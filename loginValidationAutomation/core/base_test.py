@@ -1,16 +1,158 @@
+import os
+import threading
+from contextlib import contextmanager
+
+from core.driver_pool import create_chrome_driver
+from core.timing import StepTimer
+from core.watchdog import BudgetExceeded, budget_from_env, watchdog
+
+DRIVER_QUIT_TIMEOUT = 5  # seconds an aborted session gets to quit before chromedriver is killed
+
+
+def abort_driver(driver):
+    """End a (possibly hung) WebDriver session so calls blocked on it fail.
+
+    `quit()` can itself queue behind the stuck command, so it runs on a
+    helper thread; if it has not returned in DRIVER_QUIT_TIMEOUT seconds the
+    chromedriver process is killed, which drops the blocked connection.
+    """
+    quitter = threading.Thread(target=lambda: _quietly(driver.quit), daemon=True)
+    quitter.start()
+    quitter.join(DRIVER_QUIT_TIMEOUT)
+    process = getattr(getattr(driver, "service", None), "process", None)
+    if quitter.is_alive() and process is not None:
+        _quietly(process.kill)
+
+
+def _quietly(fn):
+    try:
+        fn()
+    except Exception:
+        pass
+
+
 class BaseTest:
     """Generic test skeleton with setup, execute, teardown."""
 
     registry = []
+    driver_pool = None  # shared DriverPool; None launches a fresh browser per lease
+    browser_profile = None  # name from core.browser_profiles; BROWSER_PROFILE overrides
+    # Seconds; None falls back to TEST_TIME_BUDGET / ATTEMPT_TIME_BUDGET (unset: no limit)
+    time_budget = None
+    attempt_budget = None
 
     def __init__(self, name=None):
         self.name = name or self.__class__.__name__
+        self.timed_out = None
+        self._budget = None
+        self._leased = []
+        self._auths = []
+        self._aborted = set()
+        self._lease_lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._saved = False
+        self._phase = None
+        self._timeout_phase = None
 
     @classmethod
     def register(cls, test_cls):
         cls.registry.append(test_cls)
         return test_cls
 
+    def browser_profile_name(self):
+        return os.environ.get("BROWSER_PROFILE") or self.browser_profile
+
+    def time_budget_seconds(self):
+        return self.time_budget or budget_from_env("TEST_TIME_BUDGET")
+
+    def attempt_budget_seconds(self):
+        return self.attempt_budget or budget_from_env("ATTEMPT_TIME_BUDGET")
+
+    def acquire_driver(self):
+        if self.driver_pool is not None:
+            with self._lease_lock:
+                nested = bool(self._leased)
+            driver = self.driver_pool.acquire(self.browser_profile_name(), nested=nested)
+        else:
+            driver = create_chrome_driver(self.browser_profile_name())
+        with self._lease_lock:
+            self._leased.append(driver)
+        return driver
+
+    def release_driver(self, driver, broken=False):
+        """Return a driver from acquire_driver(); releasing it twice is a no-op."""
+        if driver is None:
+            return
+        with self._lease_lock:
+            if not any(d is driver for d in self._leased):
+                return
+            self._leased = [d for d in self._leased if d is not driver]
+            broken = broken or id(driver) in self._aborted
+            self._aborted.discard(id(driver))
+        if self.driver_pool is not None:
+            self.driver_pool.release(driver, broken=broken)
+        else:
+            _quietly(driver.quit)
+
+    def abort_driver(self, driver):
+        """Kill a leased session; its eventual release discards it from the pool."""
+        with self._lease_lock:
+            self._aborted.add(id(driver))
+        abort_driver(driver)
+
+    def track_auth(self, auth):
+        """Register an auth flow the test created, so a test timeout aborts it."""
+        with self._lease_lock:
+            self._auths.append(auth)
+        return auth
+
+    def untrack_auth(self, auth):
+        """Forget an auth flow the test has closed or released."""
+        with self._lease_lock:
+            self._auths = [a for a in self._auths if a is not auth]
+
+    def abort_auth(self, auth):
+        """Abort whatever an auth flow is blocked on: its browser or HTTP session."""
+        driver = getattr(auth, "driver", None)
+        if driver is not None:
+            self.abort_driver(driver)
+        else:
+            _quietly(auth.abort)
+
+    def abort(self):
+        """Watchdog callback for the test budget: abort every tracked auth
+        flow (browser or HTTP) and any other leased browser session."""
+        self._timeout_phase = self._timeout_phase or self._phase
+        with self._lease_lock:
+            auths = list(self._auths)
+            leased = list(self._leased)
+        done = set()
+        for auth in auths:
+            driver = getattr(auth, "driver", None)
+            if driver is not None:
+                done.add(id(driver))
+            self.abort_auth(auth)
+        for driver in leased:
+            if id(driver) not in done:
+                self.abort_driver(driver)
+
+    def check_budget(self):
+        """Raise BudgetExceeded once the test budget has run out (for loops
+        whose steps would not otherwise notice, e.g. the HTTP backend)."""
+        if self._budget is not None:
+            self._budget.check()
+
+    @contextmanager
+    def attempt_deadline(self, auth, name):
+        """Per-attempt budget; on expiry `auth`'s session is aborted.
+
+        Yields the watchdog Budget (None without a budget); callers check
+        `budget.expired` to tell a timeout from an ordinary failure.
+        """
+        with watchdog.budget(self.attempt_budget_seconds(), lambda: self.abort_auth(auth),
+                             f"{self.name} {name}") as budget:
+            yield budget
+
     def setup(self):
         pass
 
@@ -20,9 +162,84 @@ class BaseTest:
     def teardown(self):
         pass
 
+    def save_results(self):
+        """Persist the run through `self.logger` (if any) with phase timings attached.
+
+        Only the first call saves, so a run the runner abandoned is not
+        stored twice if its thread finishes later.
+        """
+        logger = getattr(self, "logger", None)
+        with self._save_lock:
+            if logger is None or self._saved:
+                return None
+            self._saved = True
+            logger.results["timings"] = self.timer.as_dict()
+            if self.timed_out:
+                logger.results["status"] = "timed_out"
+                logger.results["timeout"] = self.timed_out
+            return logger.save()
+
+    def _record_timeout(self, budget, error=None, abandoned=False):
+        if self.timed_out and self.timed_out["abandoned"]:
+            return  # the runner already recorded and saved this run
+        self.timed_out = {
+            "budget": budget,
+            "phase": self._timeout_phase or self._phase,
+            "error": f"{type(error).__name__}: {error}" if error is not None else None,
+            "abandoned": abandoned,
+        }
+        logger = getattr(self, "logger", None)
+        attempts = logger.attempt_count if logger is not None else 0
+        print(f"⏱️ {self.name} timed out during {self.timed_out['phase']} after {budget:g}s "
+              f"({attempts} attempt(s) recorded)")
+
+    def abandon(self):
+        """Runner hook for a run() that outlived its budget: free the drivers
+        and save the partial results; the stuck thread is left behind."""
+        budget = self.time_budget_seconds()
+        self.abort()
+        self._release_leases()
+        if not self.timed_out:
+            self._record_timeout(budget, abandoned=True)
+        self.save_results()
+
+    def _release_leases(self):
+        """Release (as broken) drivers a timed-out phase never got to release."""
+        with self._lease_lock:
+            leased = list(self._leased)
+        for driver in leased:
+            self.release_driver(driver, broken=True)
+
+    @contextmanager
+    def _step(self, name):
+        self._phase = name
+        with self.timer.span(name):
+            yield
+
     def run(self):
-        self.setup()
-        try:
-            return self.execute()
-        finally:
-            self.teardown()
+        self.timer = StepTimer()
+        self.timed_out = None
+        seconds = self.time_budget_seconds()
+        result = None
+        with watchdog.budget(seconds, self.abort, f"test {self.name}") as self._budget:
+            try:
+                with self._step("setup"):
+                    self.setup()
+                try:
+                    with self._step("execute"):
+                        result = self.execute()
+                finally:
+                    with self._step("teardown"):
+                        self.teardown()
+            except Exception as e:
+                if self._budget is None or not self._budget.expired:
+                    raise
+                self._record_timeout(seconds, e)
+                self._release_leases()
+            else:
+                if self._budget is not None and self._budget.expired:
+                    self._record_timeout(seconds)
+        self.save_results()
+        if self.timed_out:
+            raise BudgetExceeded(f"{self.name} exceeded its {seconds:g}s budget during {self.timed_out['phase']}")
+        return result
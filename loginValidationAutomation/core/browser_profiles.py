@@ -0,0 +1,202 @@
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+DEFAULT_PROFILE = "default"
+
+# Hosts whose requests never matter for an auth verdict (Network.setBlockedURLs patterns).
+ANALYTICS_URL_PATTERNS = [
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*hotjar.com*",
+    "*segment.io*",
+    "*sentry.io*",
+    "*intercom.io*",
+    "*facebook.net*",
+]
+FONT_URL_PATTERNS = ["*.woff2*", "*.woff*", "*.ttf*", "*.otf*", "*fonts.googleapis.com*", "*fonts.gstatic.com*"]
+
+_LEAN_ARGS = [
+    "--disable-extensions",
+    "--disable-gpu",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-sync",
+    "--mute-audio",
+]
+
+# Named profiles. Keys: headless, page_load_strategy ("normal" waits for the
+# load event, "eager" for DOMContentLoaded, "none" returns at once and leaves
+# all waiting to AuthFlow), block_images, blocked_urls, user_data_dir, args,
+# window_size.
+PROFILES = {
+    "default": {},
+    "headless": {
+        "headless": True,
+    },
+    "fast": {
+        "headless": True,
+        "page_load_strategy": "eager",
+        "block_images": True,
+        "blocked_urls": FONT_URL_PATTERNS + ANALYTICS_URL_PATTERNS,
+        "args": _LEAN_ARGS,
+    },
+    # "none" returns from driver.get before the new document exists; only use
+    # it where every step waits for its own elements (AuthFlow does).
+    "minimal": {
+        "headless": True,
+        "page_load_strategy": "none",
+        "block_images": True,
+        "blocked_urls": FONT_URL_PATTERNS + ANALYTICS_URL_PATTERNS,
+        "args": _LEAN_ARGS,
+    },
+    # Reuses a profile directory (HTTP cache, service workers) across launches.
+    "warm": {
+        "headless": True,
+        "page_load_strategy": "eager",
+        "block_images": True,
+        "blocked_urls": ANALYTICS_URL_PATTERNS,
+        "user_data_dir": "results/chrome-profiles",
+        "args": _LEAN_ARGS,
+    },
+}
+
+_launch_lock = threading.Lock()
+
+
+def get_profile(name=None):
+    name = name or DEFAULT_PROFILE
+    if name not in PROFILES:
+        raise ValueError(f"Unknown browser profile {name!r}; expected one of {sorted(PROFILES)}")
+    return PROFILES[name]
+
+
+def _free_user_data_dir(base):
+    """First numbered sub-directory of `base` no running Chrome holds.
+
+    Chrome refuses to share a user-data dir between live instances; a live
+    instance leaves a SingletonLock link in it.
+    """
+    n = 0
+    while True:
+        path = os.path.abspath(os.path.join(base, str(n)))
+        if not os.path.lexists(os.path.join(path, "SingletonLock")):
+            os.makedirs(path, exist_ok=True)
+            return path
+        n += 1
+
+
+def build_options(profile, options=None):
+    """ChromeOptions for a profile dict (Selenium is imported lazily)."""
+    from selenium import webdriver
+
+    options = options or webdriver.ChromeOptions()
+    if profile.get("headless"):
+        options.add_argument("--headless=new")
+        options.add_argument(f"--window-size={profile.get('window_size', '1280,900')}")
+    elif profile.get("window_size"):
+        options.add_argument(f"--window-size={profile['window_size']}")
+    if profile.get("page_load_strategy"):
+        options.page_load_strategy = profile["page_load_strategy"]
+    if profile.get("block_images"):
+        options.add_experimental_option(
+            "prefs", {"profile.managed_default_content_settings.images": 2}
+        )
+        options.add_argument("--blink-settings=imagesEnabled=false")
+    for arg in profile.get("args", ()):
+        options.add_argument(arg)
+    return options
+
+
+def launch(name=None, options=None):
+    """Start Chrome with the named profile; returns the WebDriver."""
+    from selenium import webdriver
+
+    profile = get_profile(name)
+    options = build_options(profile, options)
+    if profile.get("user_data_dir"):
+        with _launch_lock:
+            options.add_argument(f"--user-data-dir={_free_user_data_dir(profile['user_data_dir'])}")
+            driver = webdriver.Chrome(options=options)
+    else:
+        driver = webdriver.Chrome(options=options)
+    if profile.get("blocked_urls"):
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": profile["blocked_urls"]})
+        except Exception:
+            pass
+    return driver
+
+
+def _benchmark_profile(name, url, runs, attempt):
+    from core.auth_flow import AuthFlow
+
+    launches, loads, attempts = [], [], []
+    for _ in range(runs):
+        started = time.perf_counter()
+        driver = launch(name)
+        launches.append(time.perf_counter() - started)
+        try:
+            auth = AuthFlow(driver)
+            started = time.perf_counter()
+            driver.get(url)
+            loads.append(time.perf_counter() - started)
+            result, _ = auth.run_login_attempt(url, attempt)
+            attempts.append(result["timings"]["total"])
+        finally:
+            driver.quit()
+    return launches, loads, attempts
+
+
+def benchmark(url, profiles, runs=3, attempt=None):
+    """Launch, driver.get and full login-attempt seconds per profile (medians)."""
+    attempt = attempt or {"email": "fakeuser@test.com", "password": "wrongpass123"}
+    rows = []
+    for name in profiles:
+        launches, loads, attempts = _benchmark_profile(name, url, runs, attempt)
+        rows.append({
+            "profile": name,
+            "launch_s": round(statistics.median(launches), 3),
+            "get_s": round(statistics.median(loads), 3),
+            "attempt_s": round(statistics.median(attempts), 3),
+        })
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare browser profiles on the login page.")
+    parser.add_argument("--url", default=None, help="login page (default: AUTH_BASE_URL or --stand-in)")
+    parser.add_argument("--stand-in", action="store_true", help="benchmark against a local stand-in server")
+    parser.add_argument("--profiles", default=",".join(PROFILES), help="comma-separated (default: all)")
+    parser.add_argument("--runs", type=int, default=3, help="launches per profile")
+    args = parser.parse_args(argv)
+
+    server = None
+    url = args.url
+    if args.stand_in:
+        from core.stand_in_server import StandInAuthServer
+        server = StandInAuthServer(max_attempts=10 ** 9)
+        url = server.start() + "/"
+    url = url or os.environ.get("AUTH_BASE_URL", "https://admin.dev.xuno.co").rstrip("/") + "/"
+    try:
+        rows = benchmark(url, [p.strip() for p in args.profiles.split(",") if p.strip()], args.runs)
+    finally:
+        if server is not None:
+            server.stop()
+
+    print(f"\nProfile benchmark against {url} (median of {args.runs} runs, seconds)")
+    print(f"{'profile':<10} {'launch':>8} {'get':>8} {'attempt':>8}")
+    for row in rows:
+        print(f"{row['profile']:<10} {row['launch_s']:>8} {row['get_s']:>8} {row['attempt_s']:>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
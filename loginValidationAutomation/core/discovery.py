@@ -0,0 +1,90 @@
+import ast
+import importlib
+import os
+
+TESTS_PACKAGE = "tests"
+TESTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), TESTS_PACKAGE)
+
+
+class TestSpec:
+    """A registered test found without importing its module."""
+
+    def __init__(self, name, module, tags=(), doc=None):
+        self.name = name
+        self.module = module
+        self.tags = tuple(tags)
+        self.doc = doc
+
+    def load(self):
+        """Import the test's module (and only it) and return the test class."""
+        return getattr(importlib.import_module(self.module), self.name)
+
+
+def _is_register(decorator):
+    # @BaseTest.register or @register
+    if isinstance(decorator, ast.Attribute):
+        return decorator.attr == "register"
+    return isinstance(decorator, ast.Name) and decorator.id == "register"
+
+
+def _class_tags(node):
+    for stmt in node.body:
+        if isinstance(stmt, ast.Assign) and any(
+            isinstance(t, ast.Name) and t.id == "tags" for t in stmt.targets
+        ):
+            try:
+                return ast.literal_eval(stmt.value)
+            except ValueError:
+                return ()
+    return ()
+
+
+def scan(tests_dir=TESTS_DIR, package=TESTS_PACKAGE):
+    """Find `@BaseTest.register` classes by parsing the test modules.
+
+    Modules are read as source, so listing and filtering never import
+    Selenium or any other test dependency. Tags come from a literal `tags`
+    class attribute. Specs are returned in module-name, then source, order.
+    """
+    specs = []
+    for filename in sorted(os.listdir(tests_dir)):
+        if not filename.endswith(".py") or filename.startswith("_"):
+            continue
+        path = os.path.join(tests_dir, filename)
+        with open(path, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=path)
+        module = f"{package}.{filename[:-3]}"
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef) and any(_is_register(d) for d in node.decorator_list):
+                doc = ast.get_docstring(node)
+                specs.append(TestSpec(
+                    node.name, module, _class_tags(node),
+                    doc.splitlines()[0] if doc else None,
+                ))
+    return specs
+
+
+def _matches(patterns, hit):
+    """True if `hit` holds for some plain pattern (or none are given) and
+    for no pattern prefixed with "not "."""
+    include = [p for p in patterns if not p.startswith("not ")]
+    exclude = [p[4:] for p in patterns if p.startswith("not ")]
+    if any(hit(p) for p in exclude):
+        return False
+    return not include or any(hit(p) for p in include)
+
+
+def select(specs, keywords=(), tags=()):
+    """Filter specs: a keyword matches a case-insensitive substring of the
+    test or module name, a tag one of the test's tags; "not <pattern>"
+    excludes instead. Empty filters select everything."""
+    keywords = [k.lower() for k in keywords]
+    tags = [t.lower() for t in tags]
+    selected = []
+    for spec in specs:
+        names = (spec.name.lower(), spec.module.lower())
+        spec_tags = {t.lower() for t in spec.tags}
+        if (_matches(keywords, lambda k: any(k in n for n in names))
+                and _matches(tags, lambda t: t in spec_tags)):
+            selected.append(spec)
+    return selected
@@ -0,0 +1,106 @@
+import time
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+# chromedriver messages for a script cut short by a navigation; only these are
+# retried in the new document, any other WebDriver error is raised.
+NAVIGATION_ERROR_MARKERS = (
+    "document unloaded",
+    "execution context was destroyed",
+    "cannot find context with specified id",
+    "no such execution context",
+    "target frame detached",
+)
+
+# Runs inside the page via execute_async_script. `check(args)` is re-evaluated
+# on every DOM mutation, on popstate/hashchange and when location.href
+# changes (pushState does not fire an event, so href is sampled cheaply), and
+# the script resolves with the first truthy result or null at the deadline.
+_WAIT_PREFIX = """
+const done = arguments[arguments.length - 1];
+const args = arguments[0];
+const timeoutMs = arguments[1];
+"""
+
+_WAIT_SUFFIX = """
+let finished = false;
+let observer = null;
+let hrefTimer = null;
+let deadline = null;
+function finish(value) {
+  if (finished) return;
+  finished = true;
+  if (observer) observer.disconnect();
+  clearInterval(hrefTimer);
+  clearTimeout(deadline);
+  window.removeEventListener('popstate', evaluate);
+  window.removeEventListener('hashchange', evaluate);
+  done(value === undefined ? null : value);
+}
+function evaluate() {
+  if (finished) return;
+  let value = null;
+  try { value = check(args); } catch (e) { value = null; }
+  if (value) finish(value);
+}
+observer = new MutationObserver(evaluate);
+observer.observe(document.documentElement || document,
+                 {subtree: true, childList: true, attributes: true, characterData: true});
+window.addEventListener('popstate', evaluate);
+window.addEventListener('hashchange', evaluate);
+let lastHref = window.location.href;
+hrefTimer = setInterval(() => {
+  if (window.location.href !== lastHref) { lastHref = window.location.href; evaluate(); }
+}, 25);
+deadline = setTimeout(() => finish(null), timeoutMs);
+evaluate();
+"""
+
+
+def build_wait_script(condition_body, helpers=""):
+    """Wrap a JS function body (`args` in scope, return truthy to resolve)."""
+    return _WAIT_PREFIX + helpers + "\nfunction check(args) {\n" + condition_body + "\n}\n" + _WAIT_SUFFIX
+
+
+class DomWaiter:
+    """Event-driven waits: resolve the moment an in-page condition holds.
+
+    Replaces WebDriverWait's 0.5s polling (one or more WebDriver commands per
+    poll) with a single execute_async_script call that listens for DOM
+    mutations and URL changes. A full navigation unloads the document and
+    aborts the script; the wait is then re-armed in the new document until
+    the overall timeout runs out.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._script_timeout = None
+
+    def _ensure_script_timeout(self, seconds):
+        seconds = max(1, int(seconds) + 2)
+        if self._script_timeout is None or self._script_timeout < seconds:
+            self.driver.set_script_timeout(seconds)
+            self._script_timeout = seconds
+
+    def until(self, script, args=None, timeout=5):
+        """Run a script from build_wait_script(); returns its value or None on timeout."""
+        deadline = time.monotonic() + timeout
+        self._ensure_script_timeout(timeout)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                return self.driver.execute_async_script(script, args or {}, int(remaining * 1000))
+            except TimeoutException:
+                return None
+            except WebDriverException as e:
+                if not _is_navigation_error(e):
+                    raise
+                # Document unloaded mid-wait (navigation); re-arm in the new page.
+                time.sleep(0.02)
+
+
+def _is_navigation_error(error):
+    message = (getattr(error, "msg", None) or str(error)).lower()
+    return any(marker in message for marker in NAVIGATION_ERROR_MARKERS)
@@ -0,0 +1,199 @@
+import threading
+
+
+def create_chrome_driver(profile=None):
+    """Launch a fresh Chrome session with a named browser profile
+    (core.browser_profiles; Selenium is imported lazily)."""
+    from selenium import webdriver
+    from core import browser_profiles, network_verdict
+
+    options = webdriver.ChromeOptions()
+    if network_verdict.enabled():
+        options.set_capability("goog:loggingPrefs", network_verdict.logging_prefs())
+    return browser_profiles.launch(profile, options)
+
+
+_RESET_STORAGE_JS = (
+    "try { window.localStorage.clear(); } catch (e) {}"
+    "try { window.sessionStorage.clear(); } catch (e) {}"
+)
+
+
+class DriverPool:
+    """Bounded pool of warm WebDriver sessions shared by tests.
+
+    Leased sessions are health-checked, and on release they are reset
+    (cookies, local/session storage, current page) so the next test starts
+    clean without paying for a browser launch. A session is recycled after
+    `max_uses` leases or as soon as it fails a health check or reset.
+    When all `max_size` sessions are busy, `acquire` waits up to
+    `acquire_timeout` seconds and then hands out an unpooled overflow session
+    that is quit on release; a caller that already holds a lease
+    (`nested=True`) gets the overflow session without waiting.
+    Sessions are kept per browser profile; an idle session of another
+    profile is quit to make room when the pool is full.
+    """
+
+    def __init__(self, factory=None, max_size=2, max_uses=25,
+                 acquire_timeout=30, blank_url="about:blank"):
+        self.factory = factory or create_chrome_driver
+        self.max_size = max_size
+        self.max_uses = max_uses
+        self.acquire_timeout = acquire_timeout
+        self.blank_url = blank_url
+        self._idle = {}
+        self._profiles = {}
+        self._uses = {}
+        self._pooled = set()
+        self._overflow = set()
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def _healthy(self, driver):
+        try:
+            driver.window_handles
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def _reset(self, driver):
+        try:
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        except Exception:
+            driver.delete_all_cookies()
+        driver.execute_script(_RESET_STORAGE_JS)
+        driver.get(self.blank_url)
+
+    def _forget(self, driver):
+        """Drop a session from the books (caller holds _cond); quit it outside."""
+        self._pooled.discard(id(driver))
+        self._uses.pop(id(driver), None)
+        self._profiles.pop(id(driver), None)
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _pop_other_idle(self, profile):
+        """An idle session of another profile, taken out to free its slot."""
+        for other, idle in self._idle.items():
+            if other != profile and idle:
+                driver = idle.pop()
+                self._forget(driver)
+                return driver
+        return None
+
+    def _overflow_driver(self, profile):
+        driver = self.factory(profile)
+        with self._cond:
+            self._overflow.add(id(driver))
+        return driver
+
+    def _available(self, profile):
+        return (self._idle.get(profile) or len(self._pooled) < self.max_size
+                or any(self._idle.values()))
+
+    def acquire(self, profile=None, nested=False):
+        """Lease a session. `nested=True` means the caller already holds one
+        (extra shard/fork sessions); it then gets an overflow session right
+        away instead of waiting for a slot its own lease may be holding.
+
+        Health checks, quits and launches run outside the lock, so one hung
+        session cannot stall other acquires and releases.
+        """
+        while True:
+            evicted = None
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("DriverPool is closed")
+                if nested:
+                    ready = self._available(profile)
+                else:
+                    ready = self._cond.wait_for(lambda: self._available(profile),
+                                                timeout=self.acquire_timeout)
+                if not ready:
+                    break
+                idle = self._idle.get(profile)
+                if idle:
+                    driver = idle.pop()
+                elif len(self._pooled) < self.max_size or self._idle_other(profile):
+                    driver = None
+                    if len(self._pooled) >= self.max_size:
+                        evicted = self._pop_other_idle(profile)
+                    # Reserve the slot before the (slow) launch so other waiters see it.
+                    placeholder = object()
+                    self._pooled.add(id(placeholder))
+                else:
+                    break
+            if driver is None:
+                if evicted is not None:
+                    self._quit(evicted)
+                return self._launch(profile, placeholder)
+            if self._healthy(driver):
+                with self._cond:
+                    self._uses[id(driver)] += 1
+                return driver
+            with self._cond:
+                self._forget(driver)
+                self._cond.notify()
+            self._quit(driver)
+        return self._overflow_driver(profile)
+
+    def _idle_other(self, profile):
+        return any(idle for other, idle in self._idle.items() if other != profile)
+
+    def _launch(self, profile, placeholder):
+        try:
+            driver = self.factory(profile)
+        except Exception:
+            with self._cond:
+                self._pooled.discard(id(placeholder))
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._pooled.discard(id(placeholder))
+            self._pooled.add(id(driver))
+            self._uses[id(driver)] = 1
+            self._profiles[id(driver)] = profile
+        return driver
+
+    def release(self, driver, broken=False):
+        if driver is None:
+            return
+        with self._cond:
+            overflow = id(driver) in self._overflow
+            self._overflow.discard(id(driver))
+            recycle = broken or self._closed or self._uses.get(id(driver), 0) >= self.max_uses
+        if overflow:
+            self._quit(driver)
+            return
+        if not recycle:
+            try:
+                self._reset(driver)
+            except Exception:
+                recycle = True
+
+        with self._cond:
+            if recycle or self._closed:
+                self._forget(driver)
+            else:
+                self._idle.setdefault(self._profiles.get(id(driver)), []).append(driver)
+                driver = None
+            self._cond.notify()
+        if driver is not None:
+            self._quit(driver)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, {}
+            drivers = [driver for group in idle.values() for driver in group]
+            for driver in drivers:
+                self._forget(driver)
+            self._cond.notify_all()
+        for driver in drivers:
+            self._quit(driver)
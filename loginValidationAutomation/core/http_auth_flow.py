@@ -0,0 +1,318 @@
+import http.client
+import json
+import queue
+import socket
+import threading
+from http.cookies import SimpleCookie
+from urllib.parse import urljoin, urlsplit
+
+from core.timing import StepTimer
+
+# Auth API routes, relative to the origin of the page URL a test targets.
+ENDPOINTS = {
+    "login": "/api/auth/login",
+    "forgot_password": "/api/auth/forgot-password",
+    "verify_otp": "/api/auth/verify-otp",
+}
+# Statuses meaning "this is not an auth endpoint" rather than an auth verdict.
+NOT_AN_ENDPOINT_STATUSES = (404, 405)
+
+
+class BackendError(RuntimeError):
+    """The auth API answered with something that is not a verdict."""
+
+
+class HttpSession:
+    """Keep-alive HTTP/1.1 connections pooled per origin, with a cookie jar."""
+
+    def __init__(self, timeout=10, pool_size=4):
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.cookies = {}
+        self._pools = {}
+        self._active = set()
+        self.aborted = False
+        self._lock = threading.Lock()
+
+    def _pool(self, origin):
+        with self._lock:
+            return self._pools.setdefault(origin, queue.LifoQueue(maxsize=self.pool_size))
+
+    def _connect(self, scheme, netloc):
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout)
+        return http.client.HTTPConnection(netloc, timeout=self.timeout)
+
+    def _cookie_header(self):
+        with self._lock:
+            return "; ".join(f"{k}={v}" for k, v in self.cookies.items())
+
+    def _store_cookies(self, response):
+        for header in response.headers.get_all("Set-Cookie") or []:
+            jar = SimpleCookie()
+            jar.load(header)
+            with self._lock:
+                for key, morsel in jar.items():
+                    self.cookies[key] = morsel.value
+
+    def request(self, method, url, payload=None):
+        """Send a request; returns (status, headers, body bytes)."""
+        parts = urlsplit(url)
+        origin = (parts.scheme, parts.netloc)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        body = json.dumps(payload).encode() if payload is not None else None
+        headers = {"Accept": "application/json"}
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+        cookie = self._cookie_header()
+        if cookie:
+            headers["Cookie"] = cookie
+
+        pool = self._pool(origin)
+        try:
+            conn = pool.get_nowait()
+            reused = True
+        except queue.Empty:
+            conn = self._connect(*origin)
+            reused = False
+        try:
+            self._begin(conn)
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+            except (http.client.HTTPException, ConnectionError):
+                if not reused or self.aborted:
+                    raise
+                # Idle keep-alive connection was closed by the server; retry once.
+                self._end(conn)
+                conn.close()
+                conn = self._connect(*origin)
+                self._begin(conn)
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+            data = response.read()
+            self._store_cookies(response)
+        except Exception:
+            conn.close()
+            raise
+        finally:
+            self._end(conn)
+        if response.will_close:
+            conn.close()
+        else:
+            try:
+                pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+        return response.status, response.headers, data
+
+    def _begin(self, conn):
+        with self._lock:
+            if self.aborted:
+                raise ConnectionAbortedError("HTTP session was aborted")
+            self._active.add(conn)
+
+    def _end(self, conn):
+        with self._lock:
+            self._active.discard(conn)
+
+    def abort(self):
+        """Fail the in-flight requests now (from another thread) and refuse new ones.
+
+        close() only drops idle connections; a request in progress holds its
+        connection outside the pool, so its socket is shut down here.
+        """
+        with self._lock:
+            self.aborted = True
+            active = list(self._active)
+        for conn in active:
+            sock = conn.sock
+            if sock is not None:
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+        self.close()
+
+    def close(self):
+        with self._lock:
+            pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            while not pool.empty():
+                pool.get_nowait().close()
+
+
+class HttpAuthFlow:
+    """Browserless AuthFlow: same interface, talks to the auth API directly.
+
+    Used for cases that validate business outcomes only; each attempt is a
+    single pooled HTTP request instead of a page load plus DOM polling.
+    Success means a 2xx response; the API's `message` becomes the error
+    text and `redirect` the resulting page URL.
+    """
+
+    def __init__(self, wait_timeout=10, endpoints=None, session=None):
+        self.wait_timeout = wait_timeout
+        self.endpoints = dict(ENDPOINTS, **(endpoints or {}))
+        self.session = session or HttpSession(timeout=wait_timeout)
+        self.current_url = None
+        self.last_errors = []
+        self.last_response = None
+        self._otp_email = None
+        self.timer = StepTimer()
+
+    def _post(self, page_url, endpoint, payload):
+        api_url = urljoin(page_url, self.endpoints[endpoint])
+        with self.timer.span("request"):
+            status, _, data = self.session.request("POST", api_url, payload)
+        self.last_response = (api_url, status, data)
+        # A missing route or an HTML page is not a failed login; judging it as
+        # one would make every expected-failure case pass.
+        if status in NOT_AN_ENDPOINT_STATUSES:
+            raise BackendError(f"{api_url} returned HTTP {status}; is ENDPOINTS right for this environment?")
+        try:
+            body = json.loads(data) if data else {}
+        except ValueError:
+            raise BackendError(f"{api_url} returned a non-JSON response (HTTP {status})") from None
+        if not isinstance(body, dict):
+            raise BackendError(f"{api_url} returned JSON that is not an object (HTTP {status})")
+        message = body.get("message") or ""
+        ok = 200 <= status < 300
+        url = urljoin(page_url, body["redirect"]) if ok and body.get("redirect") else page_url
+        self.current_url = url
+        self.last_errors = [message] if message and not ok else []
+        return ok, url, list(self.last_errors), status
+
+    def _error_result(self, page_url, e):
+        return {
+            "login_success": False,
+            "error_messages": [str(e)],
+            "url": page_url,
+            "timings": self.timer.as_dict(),
+        }
+
+    def capture_artifacts(self, writer):
+        """The browserless counterpart of a page dump: the last API response."""
+        if self.last_response is None:
+            return {}
+        url, status, data = self.last_response
+        body = data.decode(errors="replace") if isinstance(data, bytes) else data
+        dump = json.dumps({"url": url, "status": status, "body": body}, indent=2)
+        return {"response": writer.submit(dump, "json")}
+
+    def open(self, url):
+        self.current_url = url
+        self.last_errors = []
+
+    def capture_state(self):
+        with self.session._lock:
+            cookies = dict(self.session.cookies)
+        return {"url": self.current_url, "cookies": cookies, "otp_email": self._otp_email}
+
+    def restore_state(self, state):
+        with self.session._lock:
+            self.session.cookies = dict(state["cookies"])
+        self._otp_email = state["otp_email"]
+        self.open(state["url"])
+        return True
+
+    def snapshot(self, error_xpath=None, verdict_xpath=None):
+        on_otp = bool(self._otp_email) and "verify-otp" in (self.current_url or "")
+        return {
+            "url": self.current_url,
+            "ready_state": "complete",
+            "errors": list(self.last_errors),
+            "verdict_errors": list(self.last_errors),
+            "locked": any("locked" in e.lower() for e in self.last_errors),
+            "otp": {"count": 6 if on_otp else 0, "enabled": on_otp, "values": []},
+        }
+
+    def run_login_attempt(self, login_url, attempt):
+        self.timer.reset()
+        self.open(login_url)
+        try:
+            ok, final_url, errors, status = self._post(
+                login_url, "login", {"email": attempt["email"], "password": attempt["password"]}
+            )
+        except (OSError, http.client.HTTPException) as e:
+            return self._error_result(login_url, e), False
+        locked = any("locked" in e.lower() for e in errors)
+        result = {
+            "login_success": ok and not locked,
+            "error_messages": errors,
+            "url": final_url,
+            "decided_by": f"http_{status}",
+            "timings": self.timer.as_dict(),
+        }
+        return result, locked
+
+    def run_forgot_password_attempt_on_current_page(self, email_value):
+        self.timer.reset()
+        page_url = self.current_url
+        try:
+            ok, final_url, errors, status = self._post(
+                page_url, "forgot_password", {"email": email_value}
+            )
+        except (OSError, http.client.HTTPException) as e:
+            return self._error_result(page_url, e)
+        if ok:
+            self._otp_email = email_value
+        return {
+            "login_success": ok,
+            "error_messages": errors,
+            "url": final_url,
+            "decided_by": f"http_{status}",
+            "timings": self.timer.as_dict(),
+        }
+
+    def wait_for_otp_ready(self, url_fragment=None, count=6, timeout=None):
+        snap = self.snapshot()
+        if not snap["otp"]["enabled"] or (url_fragment and url_fragment not in snap["url"]):
+            raise TimeoutError("OTP step not reached")
+        return snap
+
+    def run_otp_attempt_on_current_page(self, otp_value, success_url=None):
+        self.timer.reset()
+        page_url = self.current_url
+        try:
+            ok, final_url, errors, status = self._post(
+                page_url, "verify_otp", {"email": self._otp_email, "otp": str(otp_value)}
+            )
+        except (OSError, http.client.HTTPException) as e:
+            return self._error_result(page_url, e)
+        success = ok and (
+            final_url != page_url or bool(success_url and final_url.startswith(success_url))
+        )
+        return {
+            "login_success": success,
+            "error_messages": errors,
+            "url": final_url,
+            "decided_by": f"http_{status}",
+            "timings": self.timer.as_dict(),
+        }
+
+    def get_otp_errors_on_current_page(self):
+        return list(self.last_errors)
+
+    class OTPFlow:
+        def __init__(self, auth):
+            self.auth = auth
+            self.last_decided_by = None
+            self.last_timings = None
+
+        def fill_and_submit(self, otp_value, success_url=None):
+            result = self.auth.run_otp_attempt_on_current_page(otp_value, success_url)
+            self.last_decided_by = result.get("decided_by")
+            self.last_timings = result.get("timings")
+            return result["url"], result["login_success"]
+
+    def otp_flow(self):
+        return HttpAuthFlow.OTPFlow(self)
+
+    def abort(self):
+        self.session.abort()
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,363 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import ssl
+import sys
+import time
+from array import array
+from http.cookies import SimpleCookie
+from urllib.parse import urljoin, urlsplit
+
+from core.http_auth_flow import ENDPOINTS, NOT_AN_ENDPOINT_STATUSES
+
+# Upper bounds (ms) of the latency histogram buckets; the last one is open.
+HISTOGRAM_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class AsyncHttpPool:
+    """Keep-alive HTTP/1.1 connections over asyncio streams, pooled per
+    origin and shared by all virtual users (cookies stay per user)."""
+
+    def __init__(self, max_connections=100, timeout=10):
+        self.timeout = timeout
+        self._idle = {}
+        self._slots = asyncio.Semaphore(max_connections)
+
+    async def _connect(self, scheme, host, port):
+        ctx = ssl.create_default_context() if scheme == "https" else None
+        return await asyncio.open_connection(host, port, ssl=ctx)
+
+    @staticmethod
+    async def _read_response(reader):
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("connection closed before response")
+        version, status = status_line.decode("latin-1").split(" ", 2)[:2]
+        headers = []
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            headers.append((key.strip().lower(), value.strip()))
+        fields = dict(headers)
+        if fields.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if not size:
+                    await reader.readline()
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            body = b"".join(chunks)
+        elif "content-length" in fields:
+            body = await reader.readexactly(int(fields["content-length"]))
+        else:
+            body = await reader.read()
+            fields["connection"] = "close"
+        keep_alive = version == "HTTP/1.1" and fields.get("connection", "").lower() != "close"
+        return int(status), headers, body, keep_alive
+
+    async def _exchange(self, conn, raw):
+        reader, writer = conn
+        writer.write(raw)
+        await writer.drain()
+        return await self._read_response(reader)
+
+    async def request(self, method, url, payload=None, cookies=None):
+        """Returns (status, headers [(name, value)], body bytes)."""
+        parts = urlsplit(url)
+        scheme = parts.scheme or "http"
+        port = parts.port or (443 if scheme == "https" else 80)
+        origin = (scheme, parts.hostname, port)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        body = json.dumps(payload).encode() if payload is not None else b""
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {parts.netloc}",
+                 "Accept: application/json", f"Content-Length: {len(body)}"]
+        if payload is not None:
+            lines.append("Content-Type: application/json")
+        if cookies:
+            lines.append("Cookie: " + "; ".join(f"{k}={v}" for k, v in cookies.items()))
+        raw = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+        async with self._slots:
+            idle = self._idle.setdefault(origin, [])
+            reused = bool(idle)
+            conn = idle.pop() if reused else await self._connect(*origin)
+            try:
+                try:
+                    status, headers, data, keep_alive = await asyncio.wait_for(
+                        self._exchange(conn, raw), self.timeout)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    if not reused:
+                        raise
+                    # Idle keep-alive connection was closed by the server; retry once.
+                    conn[1].close()
+                    conn = await self._connect(*origin)
+                    status, headers, data, keep_alive = await asyncio.wait_for(
+                        self._exchange(conn, raw), self.timeout)
+            except BaseException:
+                conn[1].close()
+                raise
+            if keep_alive:
+                idle.append(conn)
+            else:
+                conn[1].close()
+        return status, headers, data
+
+    def close(self):
+        for idle in self._idle.values():
+            for _, writer in idle:
+                writer.close()
+        self._idle = {}
+
+
+class LoadStats:
+    """Per-request outcomes: counts, raw latencies and per-second throughput."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.latencies = {}
+        self.counts = {}
+        self.per_second = {}
+
+    def record(self, name, seconds, outcome):
+        """`outcome` is "ok", "unexpected" (wrong business verdict) or "error"
+        (transport failure / 5xx)."""
+        self.latencies.setdefault(name, array("d")).append(seconds)
+        counts = self.counts.setdefault(name, {"ok": 0, "unexpected": 0, "error": 0})
+        counts[outcome] += 1
+        second = int(time.monotonic() - self.started)
+        self.per_second[second] = self.per_second.get(second, 0) + 1
+
+    def report(self):
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        endpoints = {}
+        for name, latencies in self.latencies.items():
+            ordered = sorted(latencies)
+            pick = lambda q: round(ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))] * 1000, 1)
+            histogram = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+            for seconds in latencies:
+                ms = seconds * 1000
+                histogram[next((i for i, b in enumerate(HISTOGRAM_BUCKETS_MS) if ms <= b),
+                               len(HISTOGRAM_BUCKETS_MS))] += 1
+            counts = self.counts[name]
+            total = sum(counts.values())
+            endpoints[name] = dict(
+                counts, requests=total,
+                error_rate=round(counts["error"] / total, 4),
+                unexpected_rate=round(counts["unexpected"] / total, 4),
+                p50_ms=pick(50), p95_ms=pick(95), p99_ms=pick(99), max_ms=round(ordered[-1] * 1000, 1),
+                histogram_ms=dict(zip([f"<={b}" for b in HISTOGRAM_BUCKETS_MS] + ["more"], histogram)),
+            )
+        requests = sum(e["requests"] for e in endpoints.values())
+        return {
+            "duration_s": round(elapsed, 2),
+            "requests": requests,
+            "throughput_rps": round(requests / elapsed, 1),
+            "peak_rps": max(self.per_second.values(), default=0),
+            "endpoints": endpoints,
+        }
+
+
+def _json_object(data):
+    """True if a response body is a JSON object (an empty body counts as {})."""
+    if not data:
+        return True
+    try:
+        return isinstance(json.loads(data), dict)
+    except ValueError:
+        return False
+
+
+class VirtualUser:
+    """Replays the login attempts and the forgot-password → OTP sequence
+    against the auth API with its own cookie jar."""
+
+    def __init__(self, uid, http, base_url, stats, login_attempts=(), otp_email=None,
+                 otp_cases=(), endpoints=None, think_time=0.0):
+        self.uid = uid
+        self.http = http
+        self.base_url = base_url
+        self.stats = stats
+        self.login_attempts = list(login_attempts)
+        self.otp_email = otp_email
+        self.otp_cases = list(otp_cases)
+        self.endpoints = dict(ENDPOINTS, **(endpoints or {}))
+        self.think_time = think_time
+        self.cookies = {}
+        self.stopping = False
+
+    async def _post(self, name, payload):
+        started = time.monotonic()
+        try:
+            status, headers, data = await self.http.request(
+                "POST", urljoin(self.base_url, self.endpoints[name]), payload, self.cookies)
+        except Exception:
+            self.stats.record(name, time.monotonic() - started, "error")
+            return None
+        elapsed = time.monotonic() - started
+        for key, value in headers:
+            if key == "set-cookie":
+                jar = SimpleCookie()
+                jar.load(value)
+                self.cookies.update({k: m.value for k, m in jar.items()})
+        # Like HttpAuthFlow: a missing route or a non-JSON body is a backend
+        # problem, not a verdict on the credentials.
+        if status >= 500 or status in NOT_AN_ENDPOINT_STATUSES or not _json_object(data):
+            self.stats.record(name, elapsed, "error")
+            return None
+        return status, elapsed
+
+    async def _step(self, name, payload, expected_ok):
+        result = await self._post(name, payload)
+        if result is not None:
+            status, elapsed = result
+            ok = 200 <= status < 300
+            self.stats.record(name, elapsed, "ok" if expected_ok is None or ok == expected_ok else "unexpected")
+        if self.think_time:
+            await asyncio.sleep(random.uniform(0, 2 * self.think_time))
+
+    async def iteration(self):
+        for attempt in self.login_attempts:
+            if self.stopping:
+                return
+            await self._step("login", {"email": attempt["email"], "password": attempt["password"]},
+                             attempt.get("expected_login"))
+        if self.otp_email and self.otp_cases and not self.stopping:
+            await self._step("forgot_password", {"email": self.otp_email}, True)
+            for case in self.otp_cases:
+                if self.stopping:
+                    return
+                await self._step("verify_otp", {"otp": case["otp"], "email": self.otp_email},
+                                 case.get("expected_login"))
+
+    async def run(self, deadline):
+        while not self.stopping and time.monotonic() < deadline:
+            await self.iteration()
+
+
+def parse_ramp(spec):
+    """"10:50,30:50,5:0" → [(10.0, 50), (30.0, 50), (5.0, 0)]: each stage
+    moves linearly to its target user count over its duration (seconds)."""
+    stages = []
+    for part in spec.split(","):
+        seconds, users = part.split(":")
+        stages.append((float(seconds), int(users)))
+    return stages
+
+
+def target_users(stages, elapsed):
+    previous = 0
+    for seconds, users in stages:
+        if elapsed < seconds:
+            return round(previous + (users - previous) * (elapsed / seconds if seconds else 1))
+        elapsed -= seconds
+        previous = users
+    return previous
+
+
+async def run_load(base_url, stages, login_attempts=(), otp_email=None, otp_cases=(),
+                   max_connections=100, think_time=0.0, tick=0.1, endpoints=None):
+    """Run virtual users following the ramp `stages`; returns LoadStats.report()."""
+    http = AsyncHttpPool(max_connections=max_connections)
+    stats = LoadStats()
+    duration = sum(seconds for seconds, _ in stages)
+    deadline = time.monotonic() + duration
+    users, tasks, retired = [], [], []
+    try:
+        while time.monotonic() < deadline:
+            want = target_users(stages, time.monotonic() - stats.started)
+            while len(users) < want:
+                user = VirtualUser(len(users) + 1, http, base_url, stats, login_attempts,
+                                   otp_email, otp_cases, endpoints, think_time)
+                users.append(user)
+                tasks.append(asyncio.ensure_future(user.run(deadline)))
+            while len(users) > want:
+                users.pop().stopping = True
+                retired.append(tasks.pop())
+            await asyncio.sleep(tick)
+        for user in users:
+            user.stopping = True
+        await asyncio.gather(*tasks, *retired, return_exceptions=True)
+    finally:
+        http.close()
+    report = stats.report()
+    report["peak_users"] = max((users for _, users in stages), default=0)
+    return report
+
+
+def default_scenarios():
+    """The login attempts and OTP cases the UI tests use (tests/cases.py,
+    which unlike the test modules does not import Selenium)."""
+    from tests.cases import EMAIL, LOGIN_ATTEMPTS, OTP_CASES
+    return LOGIN_ATTEMPTS, EMAIL, OTP_CASES
+
+
+def print_report(report):
+    print(f"\n=== LOAD REPORT ({report['duration_s']}s, up to {report['peak_users']} users) ===")
+    print(f"Requests: {report['requests']}  Throughput: {report['throughput_rps']} req/s "
+          f"(peak {report['peak_rps']} req/s)")
+    for name, e in report["endpoints"].items():
+        print(f"\n{name}: {e['requests']} req, errors {e['error_rate']:.1%}, "
+              f"unexpected verdicts {e['unexpected_rate']:.1%}")
+        print(f"  p50 {e['p50_ms']}ms  p95 {e['p95_ms']}ms  p99 {e['p99_ms']}ms  max {e['max_ms']}ms")
+        peak = max(e["histogram_ms"].values()) or 1
+        for bucket, count in e["histogram_ms"].items():
+            print(f"  {bucket:>7} ms | {'#' * round(40 * count / peak):<40} {count}")
+
+
+def main(argv=None):
+    from core.attempt_sources import iter_attempts
+
+    parser = argparse.ArgumentParser(description="Replay the login/OTP scenarios as concurrent virtual users.")
+    parser.add_argument("--base-url", default=None, help="auth service origin (default: AUTH_BASE_URL)")
+    parser.add_argument("--stand-in", action="store_true", help="start a local stand-in server and target it")
+    parser.add_argument("--ramp", default="5:20,20:20,5:0",
+                        help="stages 'seconds:users,...', ramped linearly (default: %(default)s)")
+    parser.add_argument("--attempts", default=None,
+                        help="login attempts file (.csv/.jsonl) instead of the login test's LOGIN_ATTEMPTS")
+    parser.add_argument("--no-otp", action="store_true", help="skip the forgot-password → OTP sequence")
+    parser.add_argument("--connections", type=int, default=100, help="max pooled HTTP connections")
+    parser.add_argument("--think-time", type=float, default=0.0, help="mean pause between requests (s)")
+    parser.add_argument("--json", default=None, help="also write the report as JSON here")
+    args = parser.parse_args(argv)
+
+    server = None
+    base_url = args.base_url
+    if args.stand_in:
+        from core.stand_in_server import StandInAuthServer
+        # Lockout would turn every login into a 423 within seconds; load runs
+        # measure the service, not the lockout policy.
+        server = StandInAuthServer(max_attempts=10 ** 9)
+        base_url = server.start()
+        print(f"Using stand-in auth server at {base_url}")
+    if base_url is None:
+        base_url = os.environ.get("AUTH_BASE_URL", "https://admin.dev.xuno.co")
+    base_url = base_url.rstrip("/") + "/"
+
+    login_attempts, otp_email, otp_cases = default_scenarios()
+    if args.attempts:
+        login_attempts = list(iter_attempts(args.attempts))
+    if args.no_otp:
+        otp_cases = ()
+    try:
+        report = asyncio.run(run_load(
+            base_url, parse_ramp(args.ramp), login_attempts, otp_email, otp_cases,
+            max_connections=args.connections, think_time=args.think_time,
+        ))
+    finally:
+        if server is not None:
+            server.stop()
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
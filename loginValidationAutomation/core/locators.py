@@ -0,0 +1,82 @@
+import threading
+from urllib.parse import urlsplit
+
+# Evaluates every candidate locator inside the page in one round trip and
+# returns [index, element] for the first match (optionally visible only).
+RESOLVE_LOCATORS_FN = """
+function resolveLocators(locators, visibleOnly) {
+  function find(by, value) {
+    switch (by) {
+      case 'id': { const el = document.getElementById(value); return el ? [el] : []; }
+      case 'name': return Array.from(document.getElementsByName(value));
+      case 'css selector': return Array.from(document.querySelectorAll(value));
+      case 'xpath': {
+        const snap = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        const out = [];
+        for (let i = 0; i < snap.snapshotLength; i++) out.push(snap.snapshotItem(i));
+        return out;
+      }
+      case 'tag name': return Array.from(document.getElementsByTagName(value));
+      case 'class name': return Array.from(document.getElementsByClassName(value));
+    }
+    return [];
+  }
+  function visible(el) {
+    if (!el.getClientRects().length) return false;
+    const style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none' && parseFloat(style.opacity || '1') > 0;
+  }
+  for (let i = 0; i < locators.length; i++) {
+    for (const el of find(locators[i][0], locators[i][1])) {
+      if (!visibleOnly || visible(el)) return [i, el];
+    }
+  }
+  return null;
+}
+"""
+
+RESOLVE_LOCATORS_JS = RESOLVE_LOCATORS_FN + "return resolveLocators(arguments[0], arguments[1]);"
+
+
+def page_key(url):
+    """Cache key for a page: scheme, host and path (query/fragment ignored)."""
+    parts = urlsplit(url or "")
+    return f"{parts.scheme}://{parts.netloc}{parts.path}"
+
+
+class LocatorCache:
+    """Remembers which locator matched on each page so it is tried first.
+
+    A hit means the remembered locator matched again; a miss means there was
+    no entry yet or a different candidate won. `stats()` exposes the counters
+    for tuning locator lists.
+    """
+
+    def __init__(self):
+        self._winners = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def order(self, url, locators):
+        locators = [tuple(loc) for loc in locators]
+        with self._lock:
+            winner = self._winners.get((page_key(url), tuple(locators)))
+        if winner in locators:
+            locators.remove(winner)
+            locators.insert(0, winner)
+        return locators
+
+    def record(self, url, locators, winner):
+        key = (page_key(url), tuple(tuple(loc) for loc in locators))
+        winner = tuple(winner)
+        with self._lock:
+            if self._winners.get(key) == winner:
+                self.hits += 1
+            else:
+                self.misses += 1
+                self._winners[key] = winner
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._winners)}
@@ -1,12 +1,28 @@
-import json
-import os
+import heapq
+import threading
+from collections import deque
 from datetime import datetime
 
+from core.result_store import RunJournal, count_attempt, open_store
+
 
 class JsonLogger:
-    """JSON cumulative logger with summary + runs."""
+    """JSON cumulative logger with summary + runs.
+
+    With `journal=True` and a .jsonl store, attempts are not kept in
+    `results["attempts"]`: each one is appended to a journal file next to
+    the store as it is added, and save() streams the journal into the run's
+    line. A run that dies before save() is recovered from its journal by the
+    next save into the same store, marked "status": "incomplete".
+
+    Journaled attempts are written in attempt_no order: numbers passed
+    through track() are expected in that order, entries that complete early
+    wait in a heap until the next expected number is logged, and whatever
+    is still waiting (e.g. after a gap that never completed) is flushed in
+    order by save(). Without a journal, save() sorts the attempts.
+    """
 
-    def __init__(self, filename):
+    def __init__(self, filename, journal=False):
         self.filename = filename
         self.results = {
             "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
@@ -15,42 +31,55 @@ class JsonLogger:
             "logic_failures": 0,
             "attempts": []
         }
+        self.attempt_count = 0
+        self._journal = None
+        self._expected = deque()
+        self._pending = []
+        self._seq = 0
+        self._order_lock = threading.Lock()
+        if journal and filename.endswith(".jsonl"):
+            self._journal = RunJournal(filename, {"timestamp": self.results["timestamp"]})
 
-    def add_attempt(self, attempt):
-        self.results["attempts"].append(attempt)
-        if attempt.get("login_success"):
-            self.results["total_success"] += 1
-        else:
-            self.results["total_failed"] += 1
-        if not attempt.get("test_case_success", True):
-            self.results["logic_failures"] += 1
-
-    def save(self):
-        existing_data = {
-            "summary": {
-                "total_runs": 0,
-                "total_success": 0,
-                "total_failed": 0,
-                "logic_failures": 0
-            },
-            "runs": []
-        }
-
-        if os.path.exists(self.filename):
-            try:
-                with open(self.filename, "r") as f:
-                    existing_data = json.load(f)
-            except json.JSONDecodeError:
-                pass
+    def track(self, numbered):
+        """Yield the (attempt_no, attempt) pairs of `numbered`, noting each
+        number as the next one to write once it is drawn."""
+        for attempt_no, attempt in numbered:
+            with self._order_lock:
+                self._expected.append(attempt_no)
+            yield attempt_no, attempt
 
-        existing_data["summary"]["total_runs"] += 1
-        existing_data["summary"]["total_success"] += self.results["total_success"]
-        existing_data["summary"]["total_failed"] += self.results["total_failed"]
-        existing_data["summary"]["logic_failures"] += self.results["logic_failures"]
+    def add_attempt(self, attempt):
+        with self._order_lock:
+            self.attempt_count += 1
+            count_attempt(self.results, attempt)
+            if self._journal is None:
+                self.results["attempts"].append(attempt)
+                return
+            heapq.heappush(self._pending, (attempt.get("attempt_no", 0), self._seq, attempt))
+            self._seq += 1
+            self._flush_ready()
 
-        existing_data["runs"].append(self.results)
+    def _flush_ready(self):
+        while self._pending and self._expected:
+            attempt_no = self._pending[0][0]
+            if attempt_no > self._expected[0]:
+                return
+            if attempt_no == self._expected[0]:
+                self._expected.popleft()
+            self._journal.write(heapq.heappop(self._pending)[2])
 
-        with open(self.filename, "w") as f:
-            json.dump(existing_data, f, indent=4)
+    def _flush_all(self):
+        with self._order_lock:
+            while self._pending:
+                self._journal.write(heapq.heappop(self._pending)[2])
+            self._expected.clear()
 
-        return self.filename
+    def save(self):
+        """Append this run to the store picked by the file extension
+        (.jsonl → append-only store, anything else → legacy JSON document)."""
+        store = open_store(self.filename)
+        if self._journal is not None:
+            self._flush_all()
+            return store.append_journal(self._journal, self.results)
+        self.results["attempts"].sort(key=lambda e: e.get("attempt_no", 0))
+        return store.append_run(self.results)
@@ -0,0 +1,106 @@
+import json
+import os
+import re
+import time
+
+from core.http_auth_flow import ENDPOINTS
+
+# Default auth API response URLs watched in the performance log, per flow
+# step (the stand-in server's routes). Override per environment with
+# NETWORK_VERDICT_PATTERNS, a JSON object of step → regex
+# (main.py --network-pattern STEP=REGEX).
+API_PATTERNS = {name: re.escape(path) for name, path in ENDPOINTS.items()}
+
+
+def api_patterns():
+    """API_PATTERNS with the NETWORK_VERDICT_PATTERNS overrides applied."""
+    raw = os.environ.get("NETWORK_VERDICT_PATTERNS")
+    if not raw:
+        return dict(API_PATTERNS)
+    try:
+        overrides = json.loads(raw)
+    except ValueError:
+        raise ValueError(f"NETWORK_VERDICT_PATTERNS is not a JSON object: {raw!r}") from None
+    if not isinstance(overrides, dict) or set(overrides) - set(API_PATTERNS):
+        raise ValueError(f"NETWORK_VERDICT_PATTERNS keys must be among {sorted(API_PATTERNS)}")
+    return dict(API_PATTERNS, **overrides)
+
+
+def enabled():
+    """Network verdict mode is opted into with NETWORK_VERDICTS=1 (main.py --network-verdicts)."""
+    return os.environ.get("NETWORK_VERDICTS", "").lower() in ("1", "true", "yes")
+
+
+def logging_prefs():
+    """Capability that makes ChromeDriver record DevTools network events."""
+    return {"performance": "ALL"}
+
+
+class NetworkVerdictReader:
+    """Decides attempt outcomes from the auth API's HTTP response.
+
+    Reads Network.* events from Chrome's performance log, so a verdict is
+    available as soon as the response arrives, without waiting for the UI to
+    render (or mis-rendering) error text. Requires a driver created with the
+    `goog:loggingPrefs` capability from logging_prefs().
+    """
+
+    def __init__(self, driver, patterns=None, poll=0.05):
+        self.driver = driver
+        self.patterns = {name: re.compile(p) for name, p in dict(api_patterns(), **(patterns or {})).items()}
+        self.poll = poll
+
+    def drain(self):
+        """Drop buffered events so only responses to the next submit are seen."""
+        try:
+            self.driver.get_log("performance")
+        except Exception:
+            pass
+
+    def _body(self, request_id):
+        try:
+            raw = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+        except Exception:
+            return {}
+        text = raw.get("body") or ""
+        if raw.get("base64Encoded"):
+            return {}
+        try:
+            body = json.loads(text)
+            return body if isinstance(body, dict) else {"data": body}
+        except ValueError:
+            return {"message": text[:500]}
+
+    def wait_for_response(self, step, timeout=5):
+        """Return {"status", "url", "body", "message"} for the first matching
+        auth API response, or None if none arrives within `timeout`."""
+        pattern = self.patterns[step]
+        pending = {}
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                entries = self.driver.get_log("performance")
+            except Exception:
+                return None
+            for entry in entries:
+                try:
+                    message = json.loads(entry["message"])["message"]
+                except (KeyError, ValueError):
+                    continue
+                method = message.get("method")
+                params = message.get("params", {})
+                if method == "Network.responseReceived":
+                    response = params.get("response", {})
+                    if params.get("type") in ("XHR", "Fetch", "Document") and pattern.search(response.get("url", "")):
+                        pending[params["requestId"]] = response
+                elif method == "Network.loadingFinished" and params.get("requestId") in pending:
+                    response = pending[params["requestId"]]
+                    body = self._body(params["requestId"])
+                    return {
+                        "status": response.get("status"),
+                        "url": response.get("url"),
+                        "body": body,
+                        "message": body.get("message") or "",
+                    }
+            time.sleep(self.poll)
+        return None
@@ -0,0 +1,44 @@
+OTP_INPUT_CSS = "input[aria-label^='Please enter OTP character' i]"
+
+# Collects everything the flows need to judge an attempt in one round trip:
+# URL, visible error texts (for a collection XPath and a narrower verdict
+# XPath), lock indicators and the state of the OTP inputs.
+SNAPSHOT_FN = """
+function pageSnapshot(errorXPath, verdictXPath, otpCss) {
+  function texts(xpath) {
+    if (!xpath) return [];
+    const snap = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const out = [];
+    for (let i = 0; i < snap.snapshotLength; i++) {
+      const el = snap.snapshotItem(i);
+      if (!el.getClientRects || !el.getClientRects().length) continue;
+      const text = el.innerText || '';
+      // Banners left over from a same-page login attempt (see auth_flow.LOGIN_FORM_RESET_JS).
+      if (el.getAttribute('data-qa-stale') === text) continue;
+      if (text.trim()) out.push(text);
+    }
+    return out;
+  }
+  const errors = texts(errorXPath);
+  const otpInputs = Array.from(document.querySelectorAll(otpCss));
+  return {
+    url: window.location.href,
+    ready_state: document.readyState,
+    errors: errors,
+    verdict_errors: verdictXPath ? texts(verdictXPath) : errors,
+    locked: errors.some(t => t.toLowerCase().includes('locked')),
+    otp: {
+      count: otpInputs.length,
+      enabled: otpInputs.length > 0 && otpInputs.every(el => !el.disabled && !el.readOnly),
+      values: otpInputs.map(el => el.value),
+    },
+  };
+}
+"""
+
+SNAPSHOT_JS = SNAPSHOT_FN + "return pageSnapshot(arguments[0], arguments[1], arguments[2]);"
+
+
+def take_snapshot(driver, error_xpath=None, verdict_xpath=None, otp_css=OTP_INPUT_CSS):
+    """Read URL, error texts, lock flag and OTP input state in one execute_script."""
+    return driver.execute_script(SNAPSHOT_JS, error_xpath, verdict_xpath, otp_css)
@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+
+from core.result_store import _locked, _write_json_atomic
+
+CACHE_FILE = "results/attempt_cache.json"
+FLUSH_EVERY = 200  # verdicts buffered before record() merges them into the file
+
+# "all": run every attempt (default).
+# "changed": skip attempts that passed last time under the same fingerprint.
+# "failed": only re-run attempts whose last cached result failed.
+MODES = ("all", "changed", "failed")
+
+_mode = os.environ.get("RERUN_MODE", "all")
+
+
+def set_mode(mode):
+    global _mode
+    if mode not in MODES:
+        raise ValueError(f"Unknown re-run mode {mode!r}; expected one of {MODES}")
+    _mode = mode
+
+
+def get_mode():
+    return _mode
+
+
+def fingerprint(scope, url, attempt):
+    """Stable hash of a test scope, the target URL and an attempt's definition."""
+    payload = json.dumps({"scope": scope, "url": url, "attempt": attempt},
+                         sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Last verdict per attempt fingerprint, shared by all tests.
+
+    Only hashes are stored as keys, so credentials in attempt definitions
+    never reach the cache file; the cached entry is the (masked) log entry.
+    """
+
+    def __init__(self, filename=CACHE_FILE, mode=None, flush_every=FLUSH_EVERY):
+        self.filename = filename
+        self.mode = mode or get_mode()
+        self.flush_every = flush_every
+        self._entries = self._load()
+        self._updates = {}
+        self._fingerprints = {}
+        self.cached = []
+
+    def _load(self):
+        if not os.path.exists(self.filename):
+            return {}
+        try:
+            with open(self.filename, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def lookup(self, scope, url, attempt):
+        return self._entries.get(fingerprint(scope, url, attempt))
+
+    def should_run(self, cached):
+        if self.mode == "changed":
+            return cached is None or not cached["passed"]
+        if self.mode == "failed":
+            return cached is not None and not cached["passed"]
+        return True
+
+    def filter(self, scope, url, numbered):
+        """Lazily yield the (attempt_no, attempt) pairs to run. Skipped
+        attempts with a previous verdict are collected in `cached` (as their
+        old log entry with "cached": True)."""
+        for idx, attempt in numbered:
+            key = fingerprint(scope, url, attempt)
+            cached = self._entries.get(key)
+            if self.should_run(cached):
+                self._fingerprints[idx] = key
+                yield idx, attempt
+            elif cached is not None:
+                self.cached.append(dict(
+                    cached["entry"], attempt_no=idx, cached=True, cached_at=cached["timestamp"]
+                ))
+
+    def record(self, attempt_no, entry):
+        """Remember the verdict of an attempt handed out by filter(); every
+        `flush_every` verdicts are saved, so a crash loses at most that many."""
+        key = self._fingerprints.pop(attempt_no, None)
+        if key is None:
+            return
+        self._updates[key] = {
+            "passed": bool(entry.get("test_case_success")),
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "entry": entry,
+        }
+        if self.flush_every and len(self._updates) >= self.flush_every:
+            self.save()
+
+    def save(self):
+        """Merge this run's verdicts into the cache file (safe across workers)."""
+        if not self._updates:
+            return
+        directory = os.path.dirname(self.filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with _locked(self.filename):
+            entries = self._load()
+            entries.update(self._updates)
+            _write_json_atomic(self.filename, entries)
+            self._entries = entries
+        self._updates = {}
@@ -0,0 +1,312 @@
+import glob
+import itertools
+import json
+import os
+import sys
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+
+def empty_summary():
+    return {
+        "total_runs": 0,
+        "total_success": 0,
+        "total_failed": 0,
+        "logic_failures": 0
+    }
+
+
+def count_attempt(run, attempt):
+    """Update a run's totals for one attempt entry."""
+    if attempt.get("login_success"):
+        run["total_success"] += 1
+    else:
+        run["total_failed"] += 1
+    if not attempt.get("test_case_success", True):
+        run["logic_failures"] += 1
+
+
+def _add_run_to_summary(summary, run):
+    summary["total_runs"] += 1
+    summary["total_success"] += run.get("total_success", 0)
+    summary["total_failed"] += run.get("total_failed", 0)
+    summary["logic_failures"] += run.get("logic_failures", 0)
+    return summary
+
+
+_thread_locks = {}
+_thread_locks_guard = threading.Lock()
+
+
+@contextmanager
+def _locked(path):
+    """Serialize writers of `path` across threads and (POSIX) processes."""
+    key = os.path.abspath(path)
+    with _thread_locks_guard:
+        thread_lock = _thread_locks.setdefault(key, threading.Lock())
+    with thread_lock:
+        if fcntl is None:
+            yield
+            return
+        directory = os.path.dirname(key)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(key + ".lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _write_json_atomic(path, data, indent=None):
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=indent)
+    os.replace(tmp, path)
+
+
+def _ensure_newline(path):
+    """Terminate a torn last line so the next append starts a line of its own."""
+    try:
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            torn = f.read(1) != b"\n"
+    except OSError:
+        return  # missing or empty
+    if torn:
+        with open(path, "a") as f:
+            f.write("\n")
+
+
+def _write_run_line(f, run, attempts):
+    """Write `run` as one JSON line, streaming `attempts` into it."""
+    head = json.dumps({k: v for k, v in run.items() if k != "attempts"})
+    f.write(head[:-1] + (", " if len(head) > 2 else "") + '"attempts": [')
+    for n, attempt in enumerate(attempts):
+        f.write((", " if n else "") + json.dumps(attempt))
+    f.write("]}\n")
+
+
+def _pid_alive(pid):
+    if os.name == "nt":
+        return True  # no cheap check; never treat another process' journal as orphaned
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+class RunJournal:
+    """Attempts of a run in progress, one JSON line each next to the store.
+
+    The first line is the run header (timestamp). Every line is flushed as
+    it is written, so a run that never gets saved can still be recovered.
+    """
+
+    _seq = itertools.count()
+
+    def __init__(self, store_filename, header):
+        stem = os.path.splitext(store_filename)[0]
+        self.path = f"{stem}.{os.getpid()}-{next(self._seq)}.journal"
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, "w", encoding="utf-8")
+        self.write(header)
+
+    def write(self, entry):
+        if self._file.closed:
+            return  # the run was already saved (e.g. abandoned after a timeout)
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def discard(self):
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def read(path):
+        """(header, attempts iterator) of a journal file; torn lines are skipped."""
+        def lines():
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+        entries = lines()
+        return next(entries, {}), entries
+
+
+class JsonResultStore:
+    """Legacy single-document store: {"summary": ..., "runs": [...]}.
+
+    Every append rewrites the whole file; kept for existing .json logs.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+
+    def _load(self):
+        data = {"summary": empty_summary(), "runs": []}
+        if os.path.exists(self.filename):
+            try:
+                with open(self.filename, "r") as f:
+                    data = json.load(f)
+            except json.JSONDecodeError:
+                pass
+        return data
+
+    def append_run(self, run):
+        with _locked(self.filename):
+            data = self._load()
+            _add_run_to_summary(data["summary"], run)
+            data["runs"].append(run)
+            with open(self.filename, "w") as f:
+                json.dump(data, f, indent=4)
+        return self.filename
+
+    def iter_runs(self):
+        yield from self._load()["runs"]
+
+    def summary(self):
+        return self._load()["summary"]
+
+
+class JsonlResultStore:
+    """Append-only store: one JSON line per run plus a small summary sidecar.
+
+    Saving a run costs one appended line and a rewrite of the few-byte
+    summary, independent of how many runs the file already holds. Writers
+    take an exclusive lock, so parallel workers can share one store.
+    If the store does not exist yet but a legacy .json log with the same
+    stem does, that log is migrated on first append.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.summary_file = os.path.splitext(filename)[0] + ".summary.json"
+
+    def _legacy_filename(self):
+        return os.path.splitext(self.filename)[0] + ".json"
+
+    def _read_summary(self):
+        try:
+            with open(self.summary_file, "r") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            summary = empty_summary()
+            for run in self.iter_runs():
+                _add_run_to_summary(summary, run)
+            return summary
+
+    def append_run(self, run):
+        return self._append(run, run.get("attempts", ()))
+
+    def append_journal(self, journal, run):
+        """Append `run` with its attempts streamed from `journal`, then drop the journal."""
+        journal.close()
+        _, attempts = RunJournal.read(journal.path)
+        filename = self._append(run, attempts, skip=journal.path)
+        journal.discard()
+        return filename
+
+    def _append(self, run, attempts, skip=None):
+        with _locked(self.filename):
+            legacy = self._legacy_filename()
+            if not os.path.exists(self.filename) and os.path.exists(legacy):
+                migrate_json_to_jsonl(legacy, self.filename)
+            summary = self._read_summary()
+            _ensure_newline(self.filename)
+            with open(self.filename, "a") as f:
+                for orphan in self._orphaned_journals(skip):
+                    _add_run_to_summary(summary, self._recover(f, orphan))
+                _write_run_line(f, run, attempts)
+            _write_json_atomic(self.summary_file, _add_run_to_summary(summary, run), indent=4)
+        return self.filename
+
+    def _orphaned_journals(self, skip=None):
+        """Journals of runs whose process died before saving them."""
+        stem = os.path.splitext(self.filename)[0]
+        for path in sorted(glob.glob(glob.escape(stem) + ".*.journal")):
+            pid = os.path.basename(path)[len(os.path.basename(stem)) + 1:].split("-", 1)[0]
+            if path != skip and pid.isdigit() and not _pid_alive(int(pid)):
+                yield path
+
+    @staticmethod
+    def _recover(f, path):
+        header, attempts = RunJournal.read(path)
+        run = dict(header, status="incomplete", total_success=0, total_failed=0, logic_failures=0)
+        entries = []
+        for attempt in attempts:
+            count_attempt(run, attempt)
+            entries.append(attempt)
+        _write_run_line(f, run, entries)
+        os.remove(path)
+        print(f"Recovered incomplete run from {path} ({len(entries)} attempt(s))")
+        return run
+
+    def iter_runs(self):
+        if not os.path.exists(self.filename):
+            return
+        with open(self.filename, "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn line from an interrupted write
+
+    def summary(self):
+        return self._read_summary()
+
+
+def open_store(filename):
+    """Pick the storage backend from the file extension."""
+    if filename.endswith(".jsonl"):
+        return JsonlResultStore(filename)
+    return JsonResultStore(filename)
+
+
+def iter_runs(filename):
+    return open_store(filename).iter_runs()
+
+
+def migrate_json_to_jsonl(json_path, jsonl_path=None):
+    """Convert a legacy cumulative .json log into a .jsonl store + sidecar."""
+    jsonl_path = jsonl_path or os.path.splitext(json_path)[0] + ".jsonl"
+    if os.path.exists(jsonl_path) and os.path.getsize(jsonl_path) > 0:
+        raise FileExistsError(f"{jsonl_path} already exists")
+    store = JsonlResultStore(jsonl_path)
+    summary = empty_summary()
+    with open(jsonl_path, "w") as out:
+        for run in JsonResultStore(json_path).iter_runs():
+            out.write(json.dumps(run) + "\n")
+            _add_run_to_summary(summary, run)
+    _write_json_atomic(store.summary_file, summary, indent=4)
+    return jsonl_path
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("usage: python -m core.result_store <legacy.json> [<store.jsonl>]")
+        sys.exit(2)
+    print(f"Migrated → {migrate_json_to_jsonl(*sys.argv[1:3])}")
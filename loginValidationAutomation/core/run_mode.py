@@ -0,0 +1,49 @@
+import os
+import time
+
+# "fast": unattended/CI runs — fixed pauses are skipped or replaced by a
+#         readiness condition.
+# "debug": interactive runs — pauses sleep as configured so the browser can
+#          be inspected.
+MODES = ("fast", "debug")
+
+_mode = os.environ.get("RUN_MODE", "fast")
+
+
+def set_mode(mode):
+    global _mode
+    if mode not in MODES:
+        raise ValueError(f"Unknown run mode {mode!r}; expected one of {MODES}")
+    _mode = mode
+
+
+def get_mode():
+    return _mode
+
+
+def is_debug():
+    return _mode == "debug"
+
+
+def pause(seconds, ready=None, timeout=10, poll=0.05):
+    """Inspection/settle pause.
+
+    In debug mode sleeps `seconds`. In fast mode returns immediately, or,
+    when `ready` is given, as soon as `ready()` is truthy (at most `timeout`).
+    """
+    if is_debug():
+        if seconds and seconds > 0:
+            time.sleep(seconds)
+        return True
+    if ready is None:
+        return True
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if ready():
+                return True
+        except Exception:
+            pass
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(poll)
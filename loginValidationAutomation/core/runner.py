@@ -0,0 +1,101 @@
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from core.watchdog import BudgetExceeded
+
+# Seconds a test may run past its time budget (while its aborted steps
+# unwind) before the runner abandons its thread and moves on.
+ABANDON_GRACE = 30
+
+
+def build_test(test_cls):
+    """Instantiate a registered test class through its build() hook."""
+    if hasattr(test_cls, "build") and callable(getattr(test_cls, "build")):
+        return test_cls.build()
+    return test_cls()
+
+
+def _run_within_budget(test):
+    """test.run(), but never blocking the runner much past the test's budget.
+
+    The watchdog aborts the test's sessions when its budget runs out, which
+    normally makes run() return promptly. If it is stuck somewhere an abort
+    cannot reach, the thread is abandoned after ABANDON_GRACE seconds and
+    the partial results are saved from here.
+    """
+    budget = test.time_budget_seconds()
+    if not budget:
+        return test.run()
+    outcome = {}
+
+    def target():
+        try:
+            outcome["result"] = test.run()
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target, name=f"test-{test.name}", daemon=True)
+    thread.start()
+    thread.join(budget + ABANDON_GRACE)
+    if thread.is_alive():
+        test.abandon()
+        raise BudgetExceeded(
+            f"{test.name} still running {ABANDON_GRACE}s after its {budget:g}s budget; abandoned"
+        )
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome.get("result")
+
+
+def _run_one(index, test_cls):
+    started = time.perf_counter()
+    name = getattr(test_cls, "__name__", str(test_cls))
+    try:
+        test = build_test(test_cls)
+        name = test.name
+        print(f"\n=== Running: {name} ===")
+        _run_within_budget(test)
+        status, error = "passed", None
+    except BudgetExceeded as e:
+        status, error = "timed_out", str(e)
+    except Exception as e:
+        status, error = "error", f"{type(e).__name__}: {e}"
+        traceback.print_exc()
+    return {
+        "index": index,
+        "name": name,
+        "status": status,
+        "error": error,
+        "duration": round(time.perf_counter() - started, 3),
+    }
+
+
+def run_tests(test_classes, workers=1):
+    """Run tests, each in its own worker with its own driver.
+
+    Results come back in registration order regardless of completion order,
+    and an exception or timeout in one test never stops the others.
+    """
+    test_classes = list(test_classes)
+    if workers <= 1 or len(test_classes) <= 1:
+        return [_run_one(i, cls) for i, cls in enumerate(test_classes)]
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="test-worker") as pool:
+        futures = [pool.submit(_run_one, i, cls) for i, cls in enumerate(test_classes)]
+        return [f.result() for f in futures]
+
+
+def print_summary(results):
+    print("\n=== RUN SUMMARY ===")
+    for res in results:
+        mark = {"passed": "✅", "timed_out": "⏱️"}.get(res["status"], "❌")
+        line = f"{mark} {res['name']} ({res['duration']}s)"
+        if res["error"]:
+            line += f" — {res['error']}"
+        print(line)
+
+
+def exit_code(results):
+    return 0 if all(res["status"] == "passed" for res in results) else 1
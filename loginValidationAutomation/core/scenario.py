@@ -0,0 +1,112 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Step:
+    """One node of a scenario tree.
+
+    `action(ctx)` performs the step. Children are alternative continuations
+    that share everything up to and including this step. `check(ctx)`, if
+    given, confirms the state this step produced is usable; it is used to
+    validate a restored checkpoint before running a sibling branch.
+    """
+
+    def __init__(self, name, action=None, children=(), check=None):
+        self.name = name
+        self.action = action
+        self.children = list(children)
+        self.check = check
+
+
+class ScenarioContext:
+    """State handed to step actions: the auth flow plus shared records."""
+
+    def __init__(self, auth, records=None, lock=None):
+        self.auth = auth
+        self.records = records if records is not None else []
+        self.lock = lock or threading.Lock()
+        self.prefix_replays = 0
+        self.restores = 0
+
+    def record(self, entry):
+        with self.lock:
+            self.records.append(entry)
+
+    def sibling(self, auth):
+        return ScenarioContext(auth, self.records, self.lock)
+
+
+class ScenarioRunner:
+    """Runs a step tree so that shared prefixes execute once.
+
+    At a branch point the browser state (URL, cookies, local/session storage)
+    is captured through `auth.capture_state()`. Sibling branches either
+    restore it in the same session, or, with `fork`/`release` callables,
+    run concurrently in fresh sessions seeded from the checkpoint. If a
+    restore does not pass the branch point's `check`, the prefix is replayed.
+    """
+
+    def __init__(self, fork=None, release=None, max_forks=4):
+        self.fork = fork
+        self.release = release
+        self.max_forks = max_forks
+
+    def run(self, root, ctx):
+        self._run(root, ctx, [])
+        return ctx.records
+
+    def _replay(self, path, ctx):
+        ctx.prefix_replays += 1
+        for node in path:
+            if node.action:
+                node.action(ctx)
+
+    def _restore(self, node, path, ctx, checkpoint):
+        restored = False
+        try:
+            restored = ctx.auth.restore_state(checkpoint)
+            if restored and node.check:
+                node.check(ctx)
+        except Exception:
+            restored = False
+        if restored:
+            ctx.restores += 1
+        else:
+            self._replay(path, ctx)
+
+    def _run_forked(self, child, node, path, ctx, checkpoint):
+        auth = self.fork()
+        sibling = ctx.sibling(auth)
+        try:
+            self._restore(node, path, sibling, checkpoint)
+            self._run(child, sibling, path)
+        finally:
+            if self.release:
+                self.release(auth)
+
+    def _run(self, node, ctx, path):
+        if node.action:
+            node.action(ctx)
+        path = path + [node]
+        if not node.children:
+            return
+        if len(node.children) == 1:
+            self._run(node.children[0], ctx, path)
+            return
+
+        checkpoint = ctx.auth.capture_state()
+        first, rest = node.children[0], node.children[1:]
+        if self.fork is not None:
+            with ThreadPoolExecutor(max_workers=min(self.max_forks, len(rest)),
+                                    thread_name_prefix="scenario-fork") as pool:
+                futures = [pool.submit(self._run_forked, child, node, path, ctx, checkpoint)
+                           for child in rest]
+                self._run(first, ctx, path)
+                for f in futures:
+                    f.result()
+            return
+
+        self._run(first, ctx, path)
+        for child in rest:
+            self._restore(node, path, ctx, checkpoint)
+            self._run(child, ctx, path)
@@ -0,0 +1,76 @@
+import queue
+import threading
+
+
+def account_key(attempt):
+    """Attempts against the same account share lockout counters."""
+    return attempt.get("email", "").strip().lower()
+
+
+class _Shard:
+    """Consumer end of one shard queue; `close()` (or exhaustion) tells the
+    feeder to stop sending to it."""
+
+    def __init__(self, q, done):
+        self._queue = q
+        self._done = done
+        self.stopped = threading.Event()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.stopped.is_set():
+            raise StopIteration
+        item = self._queue.get()
+        if item is self._done:
+            self.stopped.set()
+            raise StopIteration
+        return item
+
+    def close(self):
+        self.stopped.set()
+
+
+def shard_stream(attempts, shards, key=account_key, numbered=False, maxsize=64, poll=0.1):
+    """Split a stream of attempts into `shards` iterators of
+    (attempt_no, attempt), fed by a background thread.
+
+    An account is pinned to the shard with the fewest attempts so far when it
+    is first seen, so its attempts stay ordered on one session. Each shard
+    buffers at most `maxsize` attempts; a full buffer pauses reading. A
+    consumer that stops early must `close()` its shard: the feeder then drops
+    that shard's attempts instead of blocking on its full buffer, and stops
+    reading once every shard is closed. With `numbered`, `attempts` already
+    yields (attempt_no, attempt) pairs.
+    """
+    shards = max(1, shards)
+    done = object()
+    consumers = [_Shard(queue.Queue(maxsize=maxsize), done) for _ in range(shards)]
+
+    def put(shard, item):
+        while not shard.stopped.is_set():
+            try:
+                shard._queue.put(item, timeout=poll)
+                return
+            except queue.Full:
+                continue
+
+    def feed():
+        assigned, loads = {}, [0] * shards
+        try:
+            for idx, attempt in (attempts if numbered else enumerate(attempts, start=1)):
+                if all(shard.stopped.is_set() for shard in consumers):
+                    return
+                k = key(attempt)
+                if k not in assigned:
+                    assigned[k] = min(range(shards), key=lambda i: (loads[i], i))
+                target = assigned[k]
+                loads[target] += 1
+                put(consumers[target], (idx, attempt))
+        finally:
+            for shard in consumers:
+                put(shard, done)
+
+    threading.Thread(target=feed, name="shard-feed", daemon=True).start()
+    return consumers
@@ -0,0 +1,430 @@
+import argparse
+import html
+import json
+import random
+import secrets
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from core.http_auth_flow import ENDPOINTS
+
+DEFAULT_ACCOUNTS = {"aryan@xuno.co": "Admin@123"}
+DEFAULT_OTP = "121212"
+
+INVALID_CREDENTIALS = "Invalid username or password."
+ATTEMPTS_LEFT = (
+    "Incorrect username or password. You have {left} attempt(s) left "
+    "or else your account will be locked."
+)
+ACCOUNT_LOCKED = "Your account has been locked. Please contact support."
+EMAIL_NOT_FOUND = "Email not found."
+INVALID_OTP = "Invalid OTP. Please try again."
+RESET_LIMIT = "You have reached the maximum number of password reset attempts."
+
+_PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>{title}</title></head>
+<body>
+<main>
+<h1>{title}</h1>
+{intro}
+<form method="post" action="{action}">
+{fields}
+<button type="submit">{button}</button>
+</form>
+<div id="errors">{errors}</div>
+{links}
+</main>
+{script}
+</body></html>"""
+
+# Like the real app, forms submit through fetch() to the JSON auth API (so
+# --network-verdicts has responses to read); the plain form post to `action`
+# only remains as the no-JavaScript fallback. `payload` maps the FormData
+# object `data` to the API's JSON body.
+_API_SUBMIT_JS = """<script>
+document.querySelector('form').addEventListener('submit', async (event) => {
+  event.preventDefault();
+  const data = Object.fromEntries(new FormData(event.target));
+  let body = {};
+  let status = 0;
+  try {
+    const response = await fetch(%(api)s, {
+      method: 'POST', credentials: 'same-origin',
+      headers: {'Content-Type': 'application/json', 'Accept': 'application/json'},
+      body: JSON.stringify(%(payload)s),
+    });
+    status = response.status;
+    try { body = await response.json(); } catch (e) {}
+    if (response.ok && body.redirect) { window.location.href = body.redirect; return; }
+  } catch (e) {}
+  const error = document.createElement('p');
+  error.className = 'error';
+  error.setAttribute('role', 'alert');
+  error.textContent = (typeof body.message === 'string' && body.message) || ('Request failed (' + status + ')');
+  document.getElementById('errors').replaceChildren(error);
+});
+</script>"""
+
+
+def _render(title, action, fields, button, errors=(), intro="", links="", api=None, payload=None):
+    error_html = "".join(f'<p class="error" role="alert">{html.escape(e)}</p>' for e in errors)
+    script = _API_SUBMIT_JS % {"api": json.dumps(api), "payload": payload} if api else ""
+    return _PAGE.format(
+        title=html.escape(title), intro=intro, action=action, fields=fields,
+        button=html.escape(button), errors=error_html, links=links, script=script,
+    )
+
+
+def login_page(errors=(), api=None):
+    fields = (
+        '<label for="email">Email</label>'
+        '<input type="email" id="email" name="email" autocomplete="username">'
+        '<label for="password">Password</label>'
+        '<input type="password" id="password" name="password" autocomplete="current-password">'
+    )
+    links = '<a href="/forgot-password">Forgot password?</a>'
+    return _render("Sign in", "/", fields, "Login", errors, links=links,
+                   api=api, payload="{email: data.email, password: data.password}")
+
+
+def forgot_password_page(errors=(), api=None):
+    fields = (
+        '<label for="email">Email</label>'
+        '<input type="email" id="email" name="email">'
+    )
+    return _render("Forgot password", "/forgot-password", fields, "Send OTP", errors,
+                   api=api, payload="{email: data.email}")
+
+
+def verify_otp_page(errors=(), length=6, api=None):
+    fields = "<label>OTP Code</label>" + "".join(
+        f'<input type="text" name="otp{i}" maxlength="1" inputmode="numeric" '
+        f'aria-label="Please enter OTP character {i}">'
+        for i in range(1, length + 1)
+    )
+    intro = (
+        "<p>We have sent OTP code to your email address.</p>"
+        "<p>Please enter the OTP. Note: Please check your spam messages</p>"
+    )
+    links = '<a href="/forgot-password">Resent OTP</a>'
+    payload = "{otp: [%s].map(i => data['otp' + i] || '').join('')}" % ", ".join(
+        str(i) for i in range(1, length + 1))
+    return _render("Verify OTP", "/verify-otp", fields, "Verify OTP", errors, intro, links,
+                   api=api, payload=payload)
+
+
+def landing_page(title):
+    return f"<!doctype html><html><body><h1>{html.escape(title)}</h1></body></html>"
+
+
+class AuthState:
+    """Accounts, lockout counters, OTP sessions. Thread-safe."""
+
+    def __init__(self, accounts=None, otp=DEFAULT_OTP, max_attempts=5, max_resets=None):
+        self.accounts = {k.lower(): v for k, v in (accounts or DEFAULT_ACCOUNTS).items()}
+        self.otp = otp
+        self.max_attempts = max_attempts
+        self.max_resets = max_resets
+        self.failures = {}
+        self.resets = {}
+        self.sessions = {}
+        self.lock = threading.Lock()
+
+    def login(self, email, password):
+        """Returns (ok, message)."""
+        email = (email or "").strip().lower()
+        with self.lock:
+            if email not in self.accounts:
+                return False, INVALID_CREDENTIALS
+            if self.failures.get(email, 0) >= self.max_attempts:
+                return False, ACCOUNT_LOCKED
+            if password == self.accounts[email]:
+                self.failures[email] = 0
+                return True, ""
+            self.failures[email] = self.failures.get(email, 0) + 1
+            left = self.max_attempts - self.failures[email]
+            if left <= 0:
+                return False, ACCOUNT_LOCKED
+            return False, ATTEMPTS_LEFT.format(left=left)
+
+    def forgot_password(self, session_id, email):
+        email = (email or "").strip().lower()
+        with self.lock:
+            if email not in self.accounts:
+                return False, EMAIL_NOT_FOUND
+            count = self.resets.get(email, 0) + 1
+            if self.max_resets is not None and count > self.max_resets:
+                return False, RESET_LIMIT
+            self.resets[email] = count
+            self.sessions[session_id] = email
+            return True, ""
+
+    def verify_otp(self, session_id, otp, email=None):
+        with self.lock:
+            if email is None:
+                email = self.sessions.get(session_id)
+            if not email or (email or "").lower() not in self.accounts:
+                return False, INVALID_OTP
+            if otp != self.otp:
+                return False, INVALID_OTP
+            self.sessions.pop(session_id, None)
+            return True, ""
+
+    def unlock_all(self):
+        with self.lock:
+            self.failures.clear()
+            self.resets.clear()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "StandInAuth/1.0"
+    # Headers and body go out in separate writes; with Nagle on, keep-alive
+    # clients would see a ~40ms delayed-ACK stall on every response.
+    disable_nagle_algorithm = True
+
+    def log_message(self, fmt, *args):
+        if self.server.verbose:
+            super().log_message(fmt, *args)
+
+    # -- plumbing --------------------------------------------------------
+    def _session_id(self):
+        for part in (self.headers.get("Cookie") or "").split(";"):
+            key, _, value = part.strip().partition("=")
+            if key == "sid" and value:
+                return value, False
+        return secrets.token_hex(8), True
+
+    def _send(self, status, body, content_type="text/html; charset=utf-8", headers=None):
+        data = body.encode() if isinstance(body, str) else body
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        if self._new_session:
+            self.send_header("Set-Cookie", f"sid={self._sid}; Path=/; HttpOnly")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _redirect(self, location):
+        self._send(303, "", headers={"Location": location})
+
+    def _json(self, status, payload):
+        self._send(status, json.dumps(payload), "application/json")
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        if (self.headers.get("Content-Type") or "").startswith("application/json"):
+            try:
+                return json.loads(raw or b"{}")
+            except ValueError:
+                return {}
+        return {k: v[0] for k, v in parse_qs(raw.decode()).items()}
+
+    def _inject(self, path):
+        """Apply configured latency and failure injection; True if handled."""
+        server = self.server
+        delay = server.latency
+        if isinstance(delay, (tuple, list)):
+            with server.rng_lock:
+                delay = server.rng.uniform(*delay)
+        if delay:
+            time.sleep(delay)
+        if server.fail_paths and path not in server.fail_paths:
+            return False
+        with server.rng_lock:
+            fail = server.failure_rate and server.rng.random() < server.failure_rate
+        if fail:
+            self._send(503, "Service temporarily unavailable", "text/plain")
+            return True
+        return False
+
+    def _api(self, name):
+        """API route the page's fetch() submits to (None: plain form posts)."""
+        return self.server.endpoints.get(name) if self.server.api_forms else None
+
+    def _prepare(self):
+        self._sid, self._new_session = self._session_id()
+        path = urlsplit(self.path).path
+        with self.server.stats_lock:
+            self.server.request_count += 1
+        return path
+
+    # -- routes ----------------------------------------------------------
+    def do_GET(self):
+        path = self._prepare()
+        if self._inject(path):
+            return
+        if path in ("/", "/login"):
+            self._send(200, login_page(api=self._api("login")))
+        elif path == "/forgot-password":
+            self._send(200, forgot_password_page(api=self._api("forgot_password")))
+        elif path == "/verify-otp":
+            self._send(200, verify_otp_page(api=self._api("verify_otp")))
+        elif path == "/dashboard":
+            self._send(200, landing_page("Dashboard"))
+        elif path == "/reset-password":
+            self._send(200, landing_page("Reset password"))
+        elif path == "/favicon.ico":
+            self._send(204, "")
+        else:
+            self._send(404, landing_page("Not found"))
+
+    def do_POST(self):
+        path = self._prepare()
+        body = self._read_body()
+        if self._inject(path):
+            return
+        state = self.server.state
+        api = {v: k for k, v in self.server.endpoints.items()}
+
+        if path in api:
+            name = api[path]
+            if name == "login":
+                ok, msg = state.login(body.get("email"), body.get("password"))
+                status = 200 if ok else (423 if msg == ACCOUNT_LOCKED else 401)
+                self._json(status, {"redirect": "/dashboard"} if ok else {"message": msg})
+            elif name == "forgot_password":
+                ok, msg = state.forgot_password(self._sid, body.get("email"))
+                status = 200 if ok else (429 if msg == RESET_LIMIT else 404)
+                self._json(status, {"redirect": "/verify-otp"} if ok else {"message": msg})
+            else:
+                ok, msg = state.verify_otp(self._sid, str(body.get("otp", "")), body.get("email"))
+                self._json(200 if ok else 400, {"redirect": "/reset-password"} if ok else {"message": msg})
+            return
+
+        if path in ("/", "/login"):
+            ok, msg = state.login(body.get("email"), body.get("password"))
+            if ok:
+                self._redirect("/dashboard")
+            else:
+                self._send(200, login_page([msg], api=self._api("login")))
+        elif path == "/forgot-password":
+            ok, msg = state.forgot_password(self._sid, body.get("email"))
+            if ok:
+                self._redirect("/verify-otp")
+            else:
+                self._send(200, forgot_password_page([msg], api=self._api("forgot_password")))
+        elif path == "/verify-otp":
+            otp = "".join(body.get(f"otp{i}", "") for i in range(1, 7))
+            ok, msg = state.verify_otp(self._sid, otp)
+            if ok:
+                self._redirect("/reset-password")
+            else:
+                self._send(200, verify_otp_page([msg], api=self._api("verify_otp")))
+        else:
+            self._send(404, landing_page("Not found"))
+
+
+class _Server(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        # Clients that hang up mid-response (e.g. an attempt aborted by the
+        # watchdog) are routine here, not server errors.
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+
+class StandInAuthServer:
+    """Local, deterministic stand-in for the admin.dev.xuno.co auth flows.
+
+    Serves the login page (with "attempt(s) left" lockout messages), the
+    forgot-password page, the six-box OTP page, and the JSON API used by
+    HttpAuthFlow. `latency` is seconds per request (or a (min, max) range),
+    `failure_rate` the share of requests answered with 503, optionally only
+    on `fail_paths`. With `api_forms` (default) the pages submit through
+    fetch() to the JSON API, like the real app; False serves plain form
+    posts. Use as a context manager or via start()/stop().
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, accounts=None, otp=DEFAULT_OTP,
+                 max_attempts=5, max_resets=None, latency=0, failure_rate=0.0,
+                 fail_paths=None, seed=0, endpoints=None, verbose=False, api_forms=True):
+        self.host = host
+        self.port = port
+        self.state = AuthState(accounts, otp, max_attempts, max_resets)
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.fail_paths = set(fail_paths or ())
+        self.seed = seed
+        self.endpoints = dict(ENDPOINTS, **(endpoints or {}))
+        self.verbose = verbose
+        self.api_forms = api_forms
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def request_count(self):
+        return self._httpd.request_count if self._httpd else 0
+
+    def start(self):
+        httpd = _Server((self.host, self.port), _Handler)
+        httpd.daemon_threads = True
+        httpd.state = self.state
+        httpd.latency = self.latency
+        httpd.failure_rate = self.failure_rate
+        httpd.fail_paths = self.fail_paths
+        httpd.endpoints = self.endpoints
+        httpd.verbose = self.verbose
+        httpd.api_forms = self.api_forms
+        httpd.rng = random.Random(self.seed)
+        httpd.rng_lock = threading.Lock()
+        httpd.stats_lock = threading.Lock()
+        httpd.request_count = 0
+        self._httpd = httpd
+        self.port = httpd.server_address[1]
+        self._thread = threading.Thread(target=httpd.serve_forever, name="stand-in-auth", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the local stand-in auth server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="share of requests answered with 503")
+    parser.add_argument("--max-attempts", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true")
+    parser.add_argument("--form-posts", action="store_true",
+                        help="pages post plain HTML forms instead of calling the JSON API")
+    args = parser.parse_args(argv)
+
+    server = StandInAuthServer(
+        host=args.host, port=args.port, latency=args.latency,
+        failure_rate=args.failure_rate, max_attempts=args.max_attempts,
+        seed=args.seed, verbose=args.verbose, api_forms=not args.form_posts,
+    )
+    print(f"Stand-in auth server on {server.start()} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import time
+from contextlib import contextmanager
+
+_listeners = []
+
+
+def add_span_listener(listener):
+    """Subscribe `listener(name, seconds)` to every finished span.
+
+    With no listeners registered, spans only cost two perf_counter() calls.
+    """
+    _listeners.append(listener)
+    return listener
+
+
+def remove_span_listener(listener):
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+class StepTimer:
+    """Accumulates named step durations (seconds) for one attempt or run."""
+
+    def __init__(self):
+        self.spans = {}
+        self._started = time.perf_counter()
+
+    def reset(self):
+        self.spans = {}
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.spans[name] = self.spans.get(name, 0.0) + elapsed
+            if _listeners:
+                for listener in list(_listeners):
+                    listener(name, elapsed)
+
+    def as_dict(self):
+        timings = {name: round(value, 4) for name, value in self.spans.items()}
+        timings["total"] = round(time.perf_counter() - self._started, 4)
+        return timings
@@ -0,0 +1,93 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+class BudgetExceeded(TimeoutError):
+    """A test or attempt ran past its time budget."""
+
+
+def budget_from_env(name, default=None):
+    """Seconds from an environment variable (empty/0 → `default`)."""
+    value = os.environ.get(name)
+    try:
+        return float(value) or default if value else default
+    except ValueError:
+        return default
+
+
+class Budget:
+    def __init__(self, name, seconds, on_expire):
+        self.name = name
+        self.seconds = seconds
+        self.deadline = time.monotonic() + seconds
+        self.on_expire = on_expire
+        self.expired = False
+
+    def check(self):
+        """Raise BudgetExceeded if the watchdog has fired for this budget."""
+        if self.expired:
+            raise BudgetExceeded(f"{self.name} exceeded its {self.seconds:g}s budget")
+
+
+class Watchdog:
+    """One background thread enforcing deadlines for any number of budgets.
+
+    A Python thread cannot be interrupted from outside, so expiry calls the
+    budget's `on_expire` instead; for browser steps that quits the WebDriver
+    session, and for the HTTP backend it shuts down the in-flight
+    connection's socket (HttpSession.abort), which makes the blocked call in
+    the test thread fail promptly. `expired` tells the caller why it failed.
+    """
+
+    def __init__(self):
+        self._budgets = set()
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._loop, name="watchdog", daemon=True)
+            self._thread.start()
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while not self._budgets:
+                    self._cond.wait()
+                now = time.monotonic()
+                due = [b for b in self._budgets if b.deadline <= now]
+                for budget in due:
+                    self._budgets.discard(budget)
+                    budget.expired = True
+                if not due:
+                    self._cond.wait(min(b.deadline for b in self._budgets) - now)
+                    continue
+            for budget in due:
+                print(f"⏱️ Watchdog: {budget.name} exceeded its {budget.seconds:g}s budget — aborting")
+                try:
+                    budget.on_expire()
+                except Exception as e:
+                    print(f"⚠️ Watchdog abort of {budget.name} failed: {e}")
+
+    @contextmanager
+    def budget(self, seconds, on_expire, name="step"):
+        """Arm a deadline for the block; yields the Budget (None if `seconds` is falsy)."""
+        if not seconds:
+            yield None
+            return
+        budget = Budget(name, seconds, on_expire)
+        with self._cond:
+            self._ensure_thread()
+            self._budgets.add(budget)
+            self._cond.notify()
+        try:
+            yield budget
+        finally:
+            with self._cond:
+                self._budgets.discard(budget)
+                self._cond.notify()
+
+
+watchdog = Watchdog()
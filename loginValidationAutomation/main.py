@@ -1,20 +1,161 @@
+import argparse
+import json
+import os
+import sys
+
+from core import browser_profiles, discovery, result_cache, run_mode
 from core.base_test import BaseTest
-from tests import login_automation  # noqa: F401 - registers tests
-from tests import forgot_password  # noqa: F401 - registers tests
+from core.driver_pool import DriverPool
+from core.runner import run_tests, print_summary, exit_code
+
+
+def discover_tests(keywords=(), tags=()):
+    """Specs of the selected tests; no test module is imported here."""
+    return discovery.select(discovery.scan(), keywords, tags)
+
+
+def list_tests(specs):
+    for spec in specs:
+        tags = f" [{', '.join(spec.tags)}]" if spec.tags else ""
+        doc = f" — {spec.doc}" if spec.doc else ""
+        print(f"{spec.name} ({spec.module}){tags}{doc}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run registered automation tests.")
+    parser.add_argument(
+        "-k", dest="keywords", action="append", default=[], metavar="KEYWORD",
+        help="only run tests whose name or module contains KEYWORD ('not KEYWORD' excludes); repeatable",
+    )
+    parser.add_argument(
+        "-t", "--tag", dest="tags", action="append", default=[], metavar="TAG",
+        help="only run tests carrying TAG ('not TAG' excludes); repeatable",
+    )
+    parser.add_argument(
+        "--list", action="store_true",
+        help="list the selected tests and exit (imports no test modules)",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="number of tests to run at the same time (each worker owns its browser)",
+    )
+    parser.add_argument(
+        "--pool-size", type=int, default=None,
+        help="warm browser sessions kept for reuse between tests (default: --workers)",
+    )
+    parser.add_argument(
+        "--max-driver-uses", type=int, default=25,
+        help="recycle a pooled browser after this many leases",
+    )
+    parser.add_argument(
+        "--no-driver-pool", action="store_true",
+        help="launch and quit a fresh browser for every test",
+    )
+    parser.add_argument(
+        "--mode", choices=run_mode.MODES, default=run_mode.get_mode(),
+        help="fast: skip fixed pauses / wait on readiness (default); debug: keep inspection pauses",
+    )
+    rerun = parser.add_mutually_exclusive_group()
+    rerun.add_argument(
+        "--changed-only", dest="rerun", action="store_const", const="changed",
+        help="skip attempts that passed last time with the same definition and URL",
+    )
+    rerun.add_argument(
+        "--failed-only", dest="rerun", action="store_const", const="failed",
+        help="only re-run attempts whose last cached result failed",
+    )
+    parser.add_argument(
+        "--browser-profile", choices=sorted(browser_profiles.PROFILES), default=None,
+        help="Chrome profile for every test (default: each test's browser_profile, else 'default')",
+    )
+    parser.add_argument(
+        "--test-timeout", type=float, default=None, metavar="SECONDS",
+        help="time budget per test; a test past it is aborted and recorded as timed out "
+             "(tests with their own time_budget keep it)",
+    )
+    parser.add_argument(
+        "--attempt-timeout", type=float, default=None, metavar="SECONDS",
+        help="time budget per login attempt / OTP case; its browser session is aborted and replaced",
+    )
+    parser.add_argument(
+        "--network-verdicts", action="store_true",
+        help="decide attempt outcomes from auth API responses in Chrome's performance log",
+    )
+    parser.add_argument(
+        "--network-pattern", action="append", default=[], metavar="STEP=REGEX",
+        help="URL regex of the auth API response for a flow step (login, forgot_password, "
+             "verify_otp) in --network-verdicts mode; repeatable",
+    )
+    parser.add_argument(
+        "--stand-in", action="store_true",
+        help="run against a local stand-in auth server instead of the dev environment",
+    )
+    parser.add_argument(
+        "--stand-in-latency", type=float, default=0.0,
+        help="seconds of latency added by the stand-in server to every response",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    specs = discover_tests(args.keywords, args.tags)
+    if args.list:
+        list_tests(specs)
+        return 0
+    run_mode.set_mode(args.mode)
+    if args.rerun:
+        result_cache.set_mode(args.rerun)
+    if args.browser_profile:
+        os.environ["BROWSER_PROFILE"] = args.browser_profile
+    if args.test_timeout:
+        os.environ["TEST_TIME_BUDGET"] = str(args.test_timeout)
+    if args.attempt_timeout:
+        os.environ["ATTEMPT_TIME_BUDGET"] = str(args.attempt_timeout)
+    if args.network_verdicts:
+        os.environ["NETWORK_VERDICTS"] = "1"
+    if args.network_pattern:
+        patterns = json.loads(os.environ.get("NETWORK_VERDICT_PATTERNS") or "{}")
+        for item in args.network_pattern:
+            step, sep, regex = item.partition("=")
+            if not sep:
+                raise SystemExit(f"--network-pattern expects STEP=REGEX, got {item!r}")
+            patterns[step] = regex
+        os.environ["NETWORK_VERDICT_PATTERNS"] = json.dumps(patterns)
+    server = None
+    if args.stand_in:
+        from core.stand_in_server import StandInAuthServer
+        server = StandInAuthServer(latency=args.stand_in_latency)
+        os.environ["AUTH_BASE_URL"] = server.start()
+        print(f"Using stand-in auth server at {server.base_url}")
+    try:
+        return _run(args, specs)
+    finally:
+        if server is not None:
+            server.stop()
 
 
-def main():
-    if not BaseTest.registry:
-        print("No tests registered.")
-        return
-    for test_cls in BaseTest.registry:
-        if hasattr(test_cls, "build") and callable(getattr(test_cls, "build")):
-            test = test_cls.build()
-        else:
-            test = test_cls(login_automation.LOGIN_URL, login_automation.LOGIN_ATTEMPTS)
-        print(f"\n=== Running: {test.name} ===")
-        test.run()
+def _run(args, specs):
+    if not specs:
+        print("No tests selected.")
+        return 0
+    # Imported only now, so AUTH_BASE_URL (e.g. from --stand-in) is seen by the
+    # test modules and unselected tests cost nothing.
+    test_classes = [spec.load() for spec in specs]
+    if not args.no_driver_pool:
+        BaseTest.driver_pool = DriverPool(
+            max_size=args.pool_size or max(1, args.workers),
+            max_uses=args.max_driver_uses,
+        )
+    try:
+        results = run_tests(test_classes, workers=args.workers)
+    finally:
+        if BaseTest.driver_pool is not None:
+            BaseTest.driver_pool.close()
+            BaseTest.driver_pool = None
+    print_summary(results)
+    return exit_code(results)
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
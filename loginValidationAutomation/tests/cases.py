@@ -0,0 +1,38 @@
+# Accounts and cases shared by the UI tests and the HTTP load generator
+# (core/load.py). Keep this module free of Selenium imports.
+
+CORRECT_EMAIL = "Aryan@xuno.co"
+CORRECT_PASSWORD = "Admin@123"
+
+WRONG_EMAIL = "fakeuser@test.com"
+WRONG_PASSWORD = "wrongpass123"
+
+LOGIN_ATTEMPTS = [
+    {
+        "label": "WRONG email + WRONG password",
+        "email": WRONG_EMAIL,
+        "password": WRONG_PASSWORD,
+        "expected_login": False
+    },
+    {
+        "label": "REAL email + WRONG password",
+        "email": CORRECT_EMAIL,
+        "password": WRONG_PASSWORD,
+        "expected_login": False
+    },
+    {
+        "label": "REAL email + REAL password",
+        "email": CORRECT_EMAIL,
+        "password": CORRECT_PASSWORD,
+        "expected_login": True
+    },
+]
+
+# Forgot-password flow
+EMAIL = "aryan@xuno.co"
+FAKE_OTP = "000000"
+REAL_OTP = "121212"
+OTP_CASES = [
+    {"label": "WRONG OTP", "otp": FAKE_OTP, "expected_login": False},
+    {"label": "REAL OTP", "otp": REAL_OTP, "expected_login": True},
+]
@@ -1,74 +1,158 @@
-from selenium import webdriver
-import time
-from selenium.webdriver.support.ui import WebDriverWait
+import os
 
 from core.base_test import BaseTest
 from core.auth_flow import AuthFlow
+from core.http_auth_flow import HttpAuthFlow
 from core.logger import JsonLogger
-from selenium.webdriver.common.by import By
+from core.assertions import evaluate_login
+from core import run_mode
+from core.attempt_sources import iter_attempts
+from core.result_cache import ResultCache
+from core.artifacts import ArtifactWriter
+from core.scenario import ScenarioContext, ScenarioRunner, Step
+from tests.cases import EMAIL, OTP_CASES
 
 EVENT_LOG = "results/forgot_password_events.log"
-LOG_FILE = "results/forgot_password_logs.json"
+LOG_FILE = "results/forgot_password_logs.jsonl"
 
-FORGOT_PASSWORD_URL = "https://admin.dev.xuno.co/forgot-password"
-VERIFY_OTP_URL = "https://admin.dev.xuno.co/verify-otp"
-EMAIL = "aryan@xuno.co"
-FAKE_OTP = "000000"
-REAL_OTP = "121212"
+BASE_URL = os.environ.get("AUTH_BASE_URL", "https://admin.dev.xuno.co").rstrip("/")
+FORGOT_PASSWORD_URL = f"{BASE_URL}/forgot-password"
+VERIFY_OTP_URL = f"{BASE_URL}/verify-otp"
+# Optional .csv/.jsonl file of OTP cases (columns: label, otp, expected_login)
+OTP_CASES_SOURCE = os.environ.get("FORGOT_PASSWORD_OTP_CASES")
 WAIT_TIMEOUT = 10
-PAGE_WAIT = 1
+# Pauses below only apply in debug mode (RUN_MODE=debug / main.py --mode debug)
+PAGE_WAIT = 1  # settle time before submitting the forgot-password email
+FINAL_INSPECTION_WAIT = 2  # seconds to keep browser on last page before exit
+AUTH_BACKEND = os.environ.get("FORGOT_PASSWORD_AUTH_BACKEND", "browser")  # "browser" or "http"
+FORK_BRANCHES = False  # run sibling OTP cases concurrently in extra sessions seeded from the checkpoint
+BROWSER_PROFILE = None  # e.g. "fast"; see core/browser_profiles.py
+CAPTURE_ARTIFACTS = True  # screenshot / page source / console log on logic breaks
+# Seconds; None uses TEST_TIME_BUDGET / ATTEMPT_TIME_BUDGET (main.py --test-timeout / --attempt-timeout)
+TIME_BUDGET = None
+OTP_CASE_TIME_BUDGET = None
 
 
 @BaseTest.register
 class ForgotPasswordTest(BaseTest):
-    def __init__(self, url):
+    """Forgot-password request followed by wrong and correct OTP cases."""
+
+    tags = ("forgot-password", "otp")
+    browser_profile = BROWSER_PROFILE
+    time_budget = TIME_BUDGET
+    attempt_budget = OTP_CASE_TIME_BUDGET
+
+    def __init__(self, url, backend=AUTH_BACKEND, otp_cases=None):
         super().__init__(name="ForgotPasswordTest")
         self.url = url
+        self.backend = backend
+        self.otp_cases = otp_cases if otp_cases is not None else OTP_CASES
         self.driver = None
         self.auth = None
+        self.spare_auths = []
+        self.artifacts = None
 
     def setup(self):
-        self.driver = webdriver.Chrome()
-        self.auth = AuthFlow(self.driver, wait_timeout=WAIT_TIMEOUT)
         self.logger = JsonLogger(LOG_FILE)
-
-    def execute(self):
-        print("\n--- FORGOT PASSWORD PAGE OPENED ---\n")
-        self.driver.get(self.url)
-        time.sleep(PAGE_WAIT)
+        self.artifacts = ArtifactWriter() if CAPTURE_ARTIFACTS else None
+        self.result_cache = ResultCache()
+        # Every case becomes a branch of the scenario tree, so the (short)
+        # list of cases to run is materialized here.
+        self.to_run = list(self.result_cache.filter(
+            self.name, self.url, enumerate(iter_attempts(self.otp_cases), start=1)
+        ))
+        self.cached_entries = self.result_cache.cached
+        if not self.to_run:
+            return
+        self.auth = self._new_auth()
+        self.driver = getattr(self.auth, "driver", None)
+
+    def _new_auth(self):
+        if self.backend == "http":
+            return self.track_auth(HttpAuthFlow(wait_timeout=WAIT_TIMEOUT))
+        return self.track_auth(AuthFlow(self.acquire_driver(), wait_timeout=WAIT_TIMEOUT))
+
+    def _release_auth(self, auth, broken=False):
+        self.untrack_auth(auth)
+        if isinstance(auth, HttpAuthFlow):
+            auth.close()
+        else:
+            self.release_driver(auth.driver, broken=broken)
+
+    def _replace_auth(self, auth):
+        """Fresh session in place of one the watchdog aborted."""
+        self._release_auth(auth, broken=True)
+        new = self._new_auth()
+        if auth is self.auth:
+            self.auth, self.driver = new, getattr(new, "driver", None)
+        else:
+            self.spare_auths.append(new)
+        return new
+
+    # -- scenario steps ------------------------------------------------------
+    def _open_forgot_password(self, ctx):
+        ctx.auth.open(self.url)
+        run_mode.pause(PAGE_WAIT, ready=lambda: ctx.auth.snapshot()["ready_state"] == "complete")
+
+    def _submit_email(self, ctx):
         # Reuse login flow helper to submit email on forgot-password page
-        self.auth.run_forgot_password_attempt_on_current_page(EMAIL)
-        # Wait for verify-otp URL before interacting with OTP fields
-        WebDriverWait(self.driver, 10).until(
-            lambda d: "verify-otp" in d.current_url
-        )
-        # Wait for OTP inputs to be enabled
-        WebDriverWait(self.driver, 10).until(
-            lambda d: all(el.is_enabled() for el in d.find_elements(
-                By.CSS_SELECTOR, "input[aria-label*='OTP character' i]"
-            ))
-        )
-
-        def dump_otp_values(tag):
+        ctx.auth.run_forgot_password_attempt_on_current_page(EMAIL)
+
+    def _wait_for_otp_page(self, ctx):
+        # Wait for verify-otp URL and enabled OTP inputs before interacting
+        ctx.auth.wait_for_otp_ready("verify-otp", timeout=10)
+
+    @staticmethod
+    def _dump_otp_values(ctx, tag):
+        try:
+            values = ctx.auth.snapshot()["otp"]["values"]
+            print(f"[OTP DEBUG] {tag}: {values}")
+        except Exception as e:
+            print(f"[OTP DEBUG] {tag}: error reading values: {e}")
+
+    def _otp_case(self, ctx, attempt_no, case):
+        """One OTP branch under the per-case budget; a timed-out case is
+        recorded as such and the branch continues in a fresh session."""
+        self.check_budget()
+        with self.attempt_deadline(ctx.auth, f"OTP case {attempt_no}") as budget:
             try:
-                inputs = self.driver.find_elements(
-                    By.CSS_SELECTOR, "input[aria-label*='OTP character' i]"
-                )
-                values = [el.get_attribute("value") for el in inputs]
-                print(f"[OTP DEBUG] {tag}: {values}")
-            except Exception as e:
-                print(f"[OTP DEBUG] {tag}: error reading values: {e}")
-
-        otp = self.auth.otp_flow()
-
-        # First attempt: wrong OTP, submit, capture popup errors
-        dump_otp_values("before fake fill")
-        final_url, success = otp.fill_and_submit(FAKE_OTP, success_url=None)
-        dump_otp_values("after fake submit")
-
-        otp_errors = self.auth.get_otp_errors_on_current_page()
+                entry = self._check_otp(ctx, attempt_no, case)
+            except Exception:
+                if budget is None or not budget.expired:
+                    raise
+        if budget is not None and budget.expired:
+            print(f"⏱️ OTP case {attempt_no} ({case['label']}) exceeded its {budget.seconds:g}s budget — session aborted")
+            entry = {
+                "attempt_no": attempt_no,
+                "label": case["label"],
+                "email": EMAIL,
+                "otp": "******",
+                "login_success": False,
+                "expected_login": case["expected_login"],
+                "test_case_success": False,
+                "timed_out": True,
+                "error_messages": [f"OTP case exceeded its {budget.seconds:g}s time budget"],
+                "url": None,
+                "decided_by": "watchdog",
+                "timings": {"total": budget.seconds},
+            }
+            ctx.auth = self._replace_auth(ctx.auth)
+        ctx.record(entry)
+
+    def _check_otp(self, ctx, attempt_no, case):
+        otp = ctx.auth.otp_flow()
+        label = case["label"]
+
+        self._dump_otp_values(ctx, f"before {label} fill")
+        final_url, success = otp.fill_and_submit(case["otp"], success_url=None)
+        success = bool(success)
+        self._dump_otp_values(ctx, f"after {label} submit")
+        if success:
+            print(f"✅ OTP success → {final_url}")
+
+        otp_errors = ctx.auth.get_otp_errors_on_current_page()
         if otp_errors:
-            print("OTP errors:")
+            print(f"OTP errors ({label}):")
             for msg in otp_errors:
                 print(f"   - {msg}")
                 if "maximum" in msg.lower() and "reset" in msg.lower():
@@ -79,65 +163,82 @@ class ForgotPasswordTest(BaseTest):
                     except Exception:
                         pass
 
-        self.logger.add_attempt({
-            "attempt_no": 1,
-            "label": "WRONG OTP",
+        expected = case["expected_login"]
+        entry = {
+            "attempt_no": attempt_no,
+            "label": label,
             "email": EMAIL,
             "otp": "******",
             "login_success": success,
-            "expected_login": False,
-            "test_case_success": (success is False),
+            "expected_login": expected,
+            "test_case_success": evaluate_login(expected, success),
             "error_messages": otp_errors,
             "url": final_url,
-        })
-
-        # Restart from email page if failed, then correct OTP and submit
-        self.driver.get(self.url)
-        time.sleep(PAGE_WAIT)
-        self.auth.run_forgot_password_attempt_on_current_page(EMAIL)
-        WebDriverWait(self.driver, 10).until(
-            lambda d: "verify-otp" in d.current_url
-        )
-        WebDriverWait(self.driver, 10).until(
-            lambda d: all(el.is_enabled() for el in d.find_elements(
-                By.CSS_SELECTOR, "input[aria-label*='OTP character' i]"
-            ))
-        )
-
-        dump_otp_values("before real fill")
-        final_url, success = otp.fill_and_submit(REAL_OTP, success_url=None)
-        dump_otp_values("after real submit")
-        if success:
-            print(f"✅ OTP success → {final_url}")
-
-        otp_errors = self.auth.get_otp_errors_on_current_page()
-        if otp_errors:
-            print("OTP errors (real):")
-            for msg in otp_errors:
-                print(f"   - {msg}")
+            "decided_by": otp.last_decided_by,
+            "timings": otp.last_timings,
+        }
+        if not entry["test_case_success"] and self.artifacts is not None:
+            entry["artifacts"] = ctx.auth.capture_artifacts(self.artifacts)
+        return entry
+
+    def scenario(self):
+        """open → submit email → verify-otp, then one branch per OTP case.
+
+        The shared prefix runs once; each further OTP case restores the
+        verify-otp checkpoint instead of replaying it.
+        """
+        branches = [
+            Step(case["label"], lambda ctx, n=n, case=case: self._otp_case(ctx, n, case))
+            for n, case in self.to_run
+        ]
+        return Step("open forgot-password", self._open_forgot_password, [
+            Step("submit email", self._submit_email, [
+                Step("wait for verify-otp", self._wait_for_otp_page, branches,
+                     check=self._wait_for_otp_page),
+            ]),
+        ])
 
-        self.logger.add_attempt({
-            "attempt_no": 2,
-            "label": "REAL OTP",
-            "email": EMAIL,
-            "otp": "******",
-            "login_success": success,
-            "expected_login": True,
-            "test_case_success": (success is True),
-            "error_messages": otp_errors,
-            "url": final_url,
-        })
-        time.sleep(2)
+    def execute(self):
+        self.logger.results["cached"] = self.cached_entries
+        if self.cached_entries:
+            print(f"Skipping {len(self.cached_entries)} OTP case(s) with a cached verdict "
+                  f"(re-run mode: {self.result_cache.mode})")
+        if not self.to_run:
+            return
 
-        self.logger.save()
+        print("\n--- FORGOT PASSWORD PAGE OPENED ---\n")
+        runner = ScenarioRunner(
+            fork=self._new_auth if FORK_BRANCHES else None,
+            release=self._release_auth,
+        )
+        ctx = ScenarioContext(self.auth)
+        try:
+            runner.run(self.scenario(), ctx)
+        finally:
+            # Also on a timeout, so the cases that finished are kept.
+            for entry in sorted(ctx.records, key=lambda e: e["attempt_no"]):
+                self.logger.add_attempt(entry)
+                self.result_cache.record(entry["attempt_no"], entry)
+            self.result_cache.save()
+        print(f"Checkpoint restores: {ctx.restores}, prefix replays: {ctx.prefix_replays}")
+        run_mode.pause(FINAL_INSPECTION_WAIT)
 
     def teardown(self):
-        if self.driver:
-            self.driver.quit()
+        if self.artifacts is not None:
+            self.artifacts.close()
+            self.logger.results["artifact_stats"] = self.artifacts.stats()
+            self.artifacts = None
+        for auth in self.spare_auths:
+            self._release_auth(auth)
+        self.spare_auths = []
+        if self.auth is not None:
+            self._release_auth(self.auth)
+        self.auth = None
+        self.driver = None
 
     @classmethod
     def build(cls):
-        return cls(FORGOT_PASSWORD_URL)
+        return cls(FORGOT_PASSWORD_URL, otp_cases=OTP_CASES_SOURCE)
 
 
 if __name__ == "__main__":
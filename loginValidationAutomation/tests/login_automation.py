@@ -1,128 +1,360 @@
-from selenium import webdriver
-import time
+import itertools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from core.base_test import BaseTest
 from core.auth_flow import AuthFlow
+from core.http_auth_flow import HttpAuthFlow
 from core.logger import JsonLogger
 from core.assertions import evaluate_login
+from core import run_mode
+from core.sharding import shard_stream
+from core.attempt_sources import email_variants, iter_attempts, matrix
+from core.account_pool import AccountPool, AttemptScheduler
+from core.result_cache import ResultCache
+from core.artifacts import ArtifactWriter
+# Credentials and cases live in a Selenium-free module so core.load can reuse them.
+from tests.cases import CORRECT_EMAIL, CORRECT_PASSWORD, LOGIN_ATTEMPTS, WRONG_PASSWORD
 
 # -------- CONFIGURATION --------
-LOGIN_URL = "https://admin.dev.xuno.co/"
-CORRECT_EMAIL = "Aryan@xuno.co"
-CORRECT_PASSWORD = "Admin@123"
-
-WRONG_EMAIL = "fakeuser@test.com"
-WRONG_PASSWORD = "wrongpass123"
-
-LOGIN_ATTEMPTS = [
-    {
-        "label": "WRONG email + WRONG password",
-        "email": WRONG_EMAIL,
-        "password": WRONG_PASSWORD,
-        "expected_login": False
-    },
-    {
-        "label": "REAL email + WRONG password",
-        "email": CORRECT_EMAIL,
-        "password": WRONG_PASSWORD,
-        "expected_login": False
-    },
-    {
-        "label": "REAL email + REAL password",
-        "email": CORRECT_EMAIL,
-        "password": CORRECT_PASSWORD,
-        "expected_login": True
-    },
-]
+BASE_URL = os.environ.get("AUTH_BASE_URL", "https://admin.dev.xuno.co").rstrip("/")
+LOGIN_URL = f"{BASE_URL}/"
+
+
+def credential_matrix():
+    """Email spellings × password classes for the real account, streamed."""
+    def expected(email_class, password_class):
+        if email_class == "unknown" or password_class != "correct":
+            return False
+        return {"exact": True, "upper": True}.get(email_class)  # padded: unspecified, skipped
+
+    return matrix(
+        email_variants(CORRECT_EMAIL),
+        {"correct": CORRECT_PASSWORD, "wrong": WRONG_PASSWORD, "empty": ""},
+        expected,
+    )
 
-LOG_FILE = "results/login_attempts_logs.json"
+
+# Where attempts come from: LOGIN_ATTEMPTS (default), a .csv/.jsonl file
+# (columns: label, email, password, expected_login), or "matrix" for
+# credential_matrix(). Files and generators are streamed, never loaded whole.
+ATTEMPT_SOURCE = os.environ.get("LOGIN_ATTEMPTS_SOURCE")
+
+LOG_FILE = "results/login_attempts_logs.jsonl"
+# Pauses below only apply in debug mode (RUN_MODE=debug / main.py --mode debug)
 DASHBOARD_WAIT = 3  # seconds to stay on dashboard after successful login
 WAIT_TIMEOUT = 10
 FINAL_INSPECTION_WAIT = 3  # seconds to keep browser on last page before exit
 CONTINUE_ON_LOCK = True  # matches previous behavior
+AUTH_BACKEND = os.environ.get("LOGIN_AUTH_BACKEND", "browser")  # "browser" or "http"
+SHARDS = 1  # concurrent browser sessions; attempts of one account stay on one shard
+# Accounts attempts may spend lockout budget on. Attempts without an "email"
+# are assigned one of them; attempts that would exhaust an account's budget
+# (LOCKOUT_BUDGET failures, keeping LOCKOUT_RESERVE unused) are deferred.
+ACCOUNT_POOL = [
+    {"email": CORRECT_EMAIL, "password": CORRECT_PASSWORD},
+]
+LOCKOUT_BUDGET = 5
+LOCKOUT_RESERVE = 1
+BROWSER_PROFILE = None  # e.g. "fast" (headless, eager load, no images/fonts/analytics); see core/browser_profiles.py
+SAME_PAGE_ATTEMPTS = False  # True: reset the login form in place between attempts instead of reloading it
+CAPTURE_ARTIFACTS = True  # screenshot / page source / console log on logic breaks
+# Seconds; None uses TEST_TIME_BUDGET / ATTEMPT_TIME_BUDGET (main.py --test-timeout / --attempt-timeout)
+TIME_BUDGET = None
+ATTEMPT_TIME_BUDGET = None
 
 
 @BaseTest.register
 class LoginAutomationTest(BaseTest):
-    def __init__(self, login_url, attempts):
+    """Credential matrix against the login page, with lockout budgets."""
+
+    tags = ("login", "lockout")
+    browser_profile = BROWSER_PROFILE
+    time_budget = TIME_BUDGET
+    attempt_budget = ATTEMPT_TIME_BUDGET
+
+    def __init__(self, login_url, attempts, shards=SHARDS, backend=AUTH_BACKEND,
+                 account_pool=ACCOUNT_POOL):
         super().__init__(name="LoginAutomationTest")
         self.login_url = login_url
         self.attempts = attempts
+        self.shards = shards
+        self.backend = backend
+        self.account_pool = account_pool
         self.driver = None
         self.auth = None
-        self.logger = JsonLogger(LOG_FILE)
+        self.shard_auths = []
+        self.logger = None
+        self.artifacts = None
 
     def setup(self):
-        self.driver = webdriver.Chrome()
-        self.auth = AuthFlow(self.driver, wait_timeout=WAIT_TIMEOUT, dashboard_wait=DASHBOARD_WAIT)
+        # Attempts go to a journal as they complete instead of piling up in memory.
+        self.logger = JsonLogger(LOG_FILE, journal=True)
+        self.artifacts = ArtifactWriter() if CAPTURE_ARTIFACTS else None
+        self._log_lock = threading.Lock()
+        self.locator_cache = None
+        self.result_cache = ResultCache()
+        # Attempts are streamed: read lazily, filtered by the result cache,
+        # and the browser is only started once the first one needs to run.
+        stream = self.result_cache.filter(
+            self.name, self.login_url, enumerate(iter_attempts(self.attempts), start=1)
+        )
+        first = next(stream, None)
+        if first is None:
+            self.to_run = iter(())
+            return
+        # Tracked so the journal is written in attempt_no order.
+        self.to_run = self.logger.track(itertools.chain([first], stream))
+        self.auth = self._new_auth()
+        self.driver = getattr(self.auth, "driver", None)
+        self.locator_cache = getattr(self.auth, "locator_cache", None)
 
-    def execute(self):
-        print("\n--- LOGIN TEST STARTED ---\n")
+    def _new_auth(self):
+        if self.backend == "http":
+            return self.track_auth(HttpAuthFlow(wait_timeout=WAIT_TIMEOUT))
+        driver = self.acquire_driver()
+        return self.track_auth(AuthFlow(
+            driver, wait_timeout=WAIT_TIMEOUT, dashboard_wait=DASHBOARD_WAIT,
+            locator_cache=self.locator_cache, same_page=SAME_PAGE_ATTEMPTS,
+        ))
+
+    def _run_attempt(self, auth, idx, attempt, tag="", budget=None):
+        result, locked = auth.run_login_attempt(self.login_url, attempt)
+        if budget is not None and budget.expired:
+            return None, False  # aborted mid-attempt; _attempt logs it as timed out
+
+        login_success = result["login_success"]
+        errors = result["error_messages"]
+        final_url = result["url"]
+
+        expected_login = attempt["expected_login"]
+        test_case_success = evaluate_login(expected_login, login_success)
+        artifacts = None
+        if not test_case_success and self.artifacts is not None:
+            artifacts = auth.capture_artifacts(self.artifacts)
 
-        for idx, attempt in enumerate(self.attempts, start=1):
-            print(f"\nAttempt {idx}: {attempt['label']}")
-            print(f"Using → {attempt['email']} / ******")
+        lines = [f"\n{tag}Attempt {idx}: {attempt['label']}", f"Using → {attempt['email']} / ******"]
+        if login_success:
+            lines.append(f"✅ Login successful → {final_url}")
+        else:
+            lines.append("❌ Login failed")
+            lines.extend(f"   - {msg}" for msg in errors)
+        if not test_case_success:
+            lines.append("🚨 LOGIC BREAK DETECTED — unexpected authentication behavior")
+        print("\n".join(lines))
 
-            result, locked = self.auth.run_login_attempt(self.login_url, attempt)
+        if login_success and self.backend != "http":
+            run_mode.pause(DASHBOARD_WAIT)
 
-            login_success = result["login_success"]
-            errors = result["error_messages"]
-            final_url = result["url"]
+        entry = {
+            "attempt_no": idx,
+            "label": attempt["label"],
+            "email": attempt["email"],
+            "password": "******",
 
-            expected_login = attempt["expected_login"]
-            test_case_success = evaluate_login(expected_login, login_success)
+            "login_success": login_success,
+            "expected_login": expected_login,
+            "test_case_success": test_case_success,
 
-            if login_success:
-                print(f"✅ Login successful → {final_url}")
-                time.sleep(DASHBOARD_WAIT)
+            "error_messages": errors,
+            "url": final_url,
+            "decided_by": result.get("decided_by"),
+            "timings": result.get("timings"),
+        }
+        if artifacts:
+            entry["artifacts"] = artifacts
+        return entry, locked
+
+    def _timed_out_entry(self, idx, attempt, budget):
+        print(f"\n⏱️ Attempt {idx} ({attempt['label']}) exceeded its {budget.seconds:g}s budget — session aborted")
+        return {
+            "attempt_no": idx,
+            "label": attempt["label"],
+            "email": attempt["email"],
+            "password": "******",
+
+            "login_success": False,
+            "expected_login": attempt["expected_login"],
+            "test_case_success": False,
+            "timed_out": True,
+
+            "error_messages": [f"Attempt exceeded its {budget.seconds:g}s time budget"],
+            "url": None,
+            "decided_by": "watchdog",
+            "timings": {"total": budget.seconds},
+        }
+
+    def _attempt(self, auth, idx, attempt, tag=""):
+        """_run_attempt under the attempt budget; returns (auth, entry, locked).
+
+        A timed-out attempt is recorded as such and the aborted session is
+        replaced, so the remaining attempts keep running.
+        """
+        self.check_budget()
+        with self.attempt_deadline(auth, f"attempt {idx}") as budget:
+            try:
+                entry, locked = self._run_attempt(auth, idx, attempt, tag, budget)
+            except Exception:
+                if budget is None or not budget.expired:
+                    raise
+        if budget is not None and budget.expired:
+            return self._replace_auth(auth), self._timed_out_entry(idx, attempt, budget), False
+        return auth, entry, locked
+
+    def _replace_auth(self, auth):
+        """Fresh session in place of one the watchdog aborted."""
+        self._close_auth(auth, broken=True)
+        new = self._new_auth()
+        with self._log_lock:
+            if auth is self.auth:
+                self.auth, self.driver = new, getattr(new, "driver", None)
             else:
-                print("❌ Login failed")
-                for msg in errors:
-                    print(f"   - {msg}")
+                self.shard_auths[self.shard_auths.index(auth)] = new
+        return new
+
+    def _log(self, entry):
+        with self._log_lock:
+            self.logger.add_attempt(entry)
+            self.result_cache.record(entry["attempt_no"], entry)
 
-            if not test_case_success:
-                print("🚨 LOGIC BREAK DETECTED — unexpected authentication behavior")
+    def _run_shard(self, auth, shard, tag=""):
+        try:
+            for idx, attempt in shard:
+                auth, entry, locked = self._attempt(auth, idx, attempt, tag)
+                self._log(entry)
+                if locked and not CONTINUE_ON_LOCK:
+                    print(f"🚫 {tag}Account locked detected. Stopping further attempts on this shard.")
+                    break
+        finally:
+            # A streamed shard must be closed, or the feeder blocks on it.
+            if hasattr(shard, "close"):
+                shard.close()
 
-            self.logger.add_attempt({
-                "attempt_no": idx,
-                "label": attempt["label"],
-                "email": attempt["email"],
-                "password": "******",
+    def _shard_auths(self, count):
+        auths = [self.auth]
+        for _ in range(count - 1):
+            auth = self._new_auth()
+            self.shard_auths.append(auth)
+            auths.append(auth)
+        return auths
 
-                "login_success": login_success,
-                "expected_login": expected_login,
-                "test_case_success": test_case_success,
+    def _run_parallel(self, fn, jobs, prefix):
+        with ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix=f"login-{prefix}") as pool:
+            futures = [
+                pool.submit(fn, auth, job, f"[{prefix} {n}] ")
+                for n, (auth, job) in enumerate(jobs, start=1)
+            ]
+            for f in futures:
+                f.result()
 
-                "error_messages": errors,
-                "url": final_url
-            })
+    def _run_sharded(self, numbered):
+        shards = shard_stream(numbered, self.shards, numbered=True)
+        print(f"Running attempts across {len(shards)} browser session(s)")
+        try:
+            self._run_parallel(self._run_shard, list(zip(self._shard_auths(len(shards)), shards)), "shard")
+        finally:
+            for shard in shards:
+                shard.close()
 
-            if locked and not CONTINUE_ON_LOCK:
-                print("🚫 Account locked detected. Stopping further attempts.")
-                break
+    def _run_worker(self, auth, scheduler, tag=""):
+        while True:
+            job = scheduler.next()
+            if job is None:
+                return
+            idx, attempt, lease = job
+            login_success, errors = False, []
+            try:
+                auth, entry, _ = self._attempt(auth, idx, attempt, tag)
+                login_success, errors = entry["login_success"], entry["error_messages"]
+            finally:
+                scheduler.done(lease, attempt, login_success, errors)
+            if lease[1] is not None:
+                entry["account_remaining"] = lease[1].remaining
+            self._log(entry)
+
+    def _run_scheduled(self, pool, numbered):
+        scheduler = AttemptScheduler(numbered, pool, numbered=True)
+        workers = max(1, self.shards)
+        if workers == 1:
+            self._run_worker(self.auth, scheduler)
+        else:
+            print(f"Scheduling attempts across {workers} browser session(s)")
+            auths = self._shard_auths(workers)
+            self._run_parallel(self._run_worker, [(auth, scheduler) for auth in auths], "worker")
+        for idx, attempt in scheduler.deferred:
+            print(f"⏸️ Attempt {idx} deferred — no account has lockout budget left: {attempt['label']}")
+        self.logger.results["deferred"] = [
+            {"attempt_no": idx, "label": attempt["label"], "email": attempt.get("email")}
+            for idx, attempt in scheduler.deferred
+        ]
+        self.logger.results["accounts"] = pool.stats()
+
+    def execute(self):
+        print("\n--- LOGIN TEST STARTED ---\n")
+
+        numbered = self.to_run
+        try:
+            if self.auth is not None:
+                if self.account_pool:
+                    pool = AccountPool(self.account_pool, budget=LOCKOUT_BUDGET, reserve=LOCKOUT_RESERVE)
+                    self._run_scheduled(pool, numbered)
+                elif self.shards > 1:
+                    self._run_sharded(numbered)
+                else:
+                    self._run_shard(self.auth, numbered)
+        finally:
+            # Also on a timeout, so the verdicts that finished are kept.
+            self.result_cache.save()
+        self.cached_entries = self.result_cache.cached
+        self.logger.results["cached"] = self.cached_entries
+        if self.cached_entries:
+            print(f"Skipped {len(self.cached_entries)} attempt(s) with a cached verdict "
+                  f"(re-run mode: {self.result_cache.mode})")
 
         print("\n--- LOGIN TEST FINISHED ---\n")
         print(f"Run Timestamp: {self.logger.results['timestamp']}")
-        print(f"Total Attempts: {len(self.logger.results['attempts'])}")
+        print(f"Total Attempts: {self.logger.attempt_count}")
         print(f"Login Successes: {self.logger.results['total_success']}")
         print(f"Login Failures: {self.logger.results['total_failed']}")
         print(f"🚨 Logic Failures: {self.logger.results['logic_failures']}")
-        print("\n🟢 Browser left open for inspection.")
+        if self.cached_entries:
+            cached_failures = sum(1 for e in self.cached_entries if not e.get("test_case_success"))
+            print(f"Cached Verdicts: {len(self.cached_entries)} ({cached_failures} logic failure(s))")
+        if self.locator_cache is not None:
+            print(f"Locator cache: {self.locator_cache.stats()}")
 
-        # Give time to inspect the final page state before exiting
-        if FINAL_INSPECTION_WAIT and FINAL_INSPECTION_WAIT > 0:
-            time.sleep(FINAL_INSPECTION_WAIT)
+        if self.driver is not None and run_mode.is_debug():
+            print("\n🟢 Browser left open for inspection.")
+            # Give time to inspect the final page state before exiting
+            run_mode.pause(FINAL_INSPECTION_WAIT)
 
-        self.logger.save()
+    def _close_auth(self, auth, broken=False):
+        self.untrack_auth(auth)
+        if isinstance(auth, HttpAuthFlow):
+            auth.close()
+        else:
+            self.release_driver(auth.driver, broken=broken)
 
     def teardown(self):
-        if self.driver:
-            self.driver.quit()
+        if self.artifacts is not None:
+            self.artifacts.close()
+            self.logger.results["artifact_stats"] = self.artifacts.stats()
+            self.artifacts = None
+        for auth in self.shard_auths:
+            self._close_auth(auth)
+        self.shard_auths = []
+        if self.auth is not None:
+            self._close_auth(self.auth)
+        self.auth = None
+        self.driver = None
 
 
     @classmethod
     def build(cls):
-        return cls(LOGIN_URL, LOGIN_ATTEMPTS)
+        if ATTEMPT_SOURCE == "matrix":
+            return cls(LOGIN_URL, credential_matrix)
+        return cls(LOGIN_URL, ATTEMPT_SOURCE or LOGIN_ATTEMPTS)
 
 
 if __name__ == "__main__":